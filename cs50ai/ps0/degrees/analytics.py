@@ -0,0 +1,161 @@
+import sys
+from array import array
+from collections import Counter
+
+import snapshot
+
+
+class Expansion():
+    """
+    Level-by-level breadth-first expansion over a Graph.
+
+    Frontiers are int arrays of person indices and the visited sets
+    are bytearrays shared across calls, so expanding a level costs a
+    few array slices per person and movie instead of a tuple per edge,
+    and a whole-graph pass visits every person and movie once.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.seen_people = bytearray(len(graph.person_ids))
+        self.seen_movies = bytearray(len(graph.movie_ids))
+
+    def start(self, person):
+        """
+        Marks a person index visited and returns it as a frontier.
+        """
+        self.seen_people[person] = 1
+        return array("i", [person])
+
+    def expand(self, frontier):
+        """
+        Returns the people one hop from a frontier that have not been
+        visited yet, marking them and the movies joining them visited.
+        """
+        graph = self.graph
+        person_offsets, person_movies = graph.person_offsets, graph.person_movies
+        movie_offsets, movie_stars = graph.movie_offsets, graph.movie_stars
+        seen_people, seen_movies = self.seen_people, self.seen_movies
+
+        movies = array("i")
+        for person in frontier:
+            movies.extend(person_movies[person_offsets[person]:person_offsets[person + 1]])
+
+        stars = array("i")
+        for movie in movies:
+            if not seen_movies[movie]:
+                seen_movies[movie] = 1
+                stars.extend(movie_stars[movie_offsets[movie]:movie_offsets[movie + 1]])
+
+        next_frontier = array("i")
+        for star in stars:
+            if not seen_people[star]:
+                seen_people[star] = 1
+                next_frontier.append(star)
+        return next_frontier
+
+    def levels(self, person):
+        """
+        Yields the frontier at each distance from a person index,
+        starting with the person alone at distance 0.
+        """
+        frontier = self.start(person)
+        while frontier:
+            yield frontier
+            frontier = self.expand(frontier)
+
+
+def neighborhood_sizes(graph, person_id, k=None):
+    """
+    Returns a list whose entry d is the number of people exactly d
+    degrees away from a person, up to distance `k` if given.
+    """
+    sizes = []
+    for depth, frontier in enumerate(Expansion(graph).levels(graph.person_index[person_id])):
+        if k is not None and depth > k:
+            break
+        sizes.append(len(frontier))
+    return sizes
+
+
+def k_hop_size(graph, person_id, k):
+    """
+    Returns the number of people within `k` degrees of a person,
+    not counting the person themselves.
+    """
+    return sum(neighborhood_sizes(graph, person_id, k)) - 1
+
+
+def eccentricity(graph, person_id):
+    """
+    Returns the greatest number of degrees between a person and
+    anyone they are connected to.
+    """
+    return len(neighborhood_sizes(graph, person_id)) - 1
+
+
+def components(graph):
+    """
+    Returns (labels, sizes): the component index of every person
+    index, and the number of people in each component, with
+    components numbered from largest to smallest.
+    """
+    expansion = Expansion(graph)
+    labels = array("i", [-1]) * len(graph.person_ids)
+    sizes = []
+    for person in range(len(graph.person_ids)):
+        if expansion.seen_people[person]:
+            continue
+        component = len(sizes)
+        size = 0
+        for frontier in expansion.levels(person):
+            for member in frontier:
+                labels[member] = component
+            size += len(frontier)
+        sizes.append(size)
+
+    # Renumber so that component 0 is the largest
+    order = sorted(range(len(sizes)), key=lambda component: -sizes[component])
+    rank = array("i", [0]) * len(sizes)
+    for new, old in enumerate(order):
+        rank[old] = new
+    labels = array("i", (rank[label] for label in labels))
+    return labels, [sizes[old] for old in order]
+
+
+def degree_distribution(graph):
+    """
+    Returns a Counter mapping a number of movies to how many
+    people starred in exactly that many.
+    """
+    offsets = graph.person_offsets
+    return Counter(offsets[person + 1] - offsets[person] for person in range(len(graph.person_ids)))
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python analytics.py directory [person_id]")
+    graph = snapshot.load(sys.argv[1])
+
+    _, sizes = components(graph)
+    isolated = sum(1 for size in sizes if size == 1)
+    print(f"{len(graph.person_ids):,} people in {len(sizes):,} components "
+          f"({isolated:,} on their own).")
+    for i, size in enumerate(sizes[:10]):
+        print(f"  component {i}: {size:,} people")
+
+    print("Movies per person:")
+    for movies, count in sorted(degree_distribution(graph).items()):
+        print(f"  {movies}: {count:,}")
+
+    if len(sys.argv) == 3:
+        person_id = sys.argv[2]
+        name = graph.person(person_id)["name"]
+        levels = neighborhood_sizes(graph, person_id)
+        print(f"{name} has eccentricity {len(levels) - 1}.")
+        for depth, size in enumerate(levels[1:], start=1):
+            print(f"  {size:,} people at {depth} degrees")
+
+
+if __name__ == "__main__":
+    main()
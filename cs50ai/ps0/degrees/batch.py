@@ -0,0 +1,154 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import snapshot
+
+# The graph a pool worker attached to in its initializer
+worker_graph = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer degrees queries in bulk as JSON lines.")
+    parser.add_argument("directory")
+    parser.add_argument("pairs", nargs="?", help="CSV of source,target person ids (default: stdin)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes, 0 for one per core (default: 1)")
+    args = parser.parse_args()
+
+    if args.pairs is None:
+        answer(args, sys.stdin)
+    else:
+        with open(args.pairs, encoding="utf-8", newline="") as f:
+            answer(args, f)
+
+
+def answer(args, f):
+    pairs = read_pairs(f)
+    if args.workers == 1:
+        results = run_queries(snapshot.load(args.directory), pairs)
+    else:
+        results = run_queries_parallel(args.directory, pairs, args.workers or os.cpu_count())
+    write_results(results, sys.stdout)
+
+
+def read_pairs(f):
+    """
+    Yields (source, target) person id pairs from CSV lines, skipping
+    blank lines and an optional `source,target` header.
+    """
+    for row in csv.reader(f):
+        if not row or row == ["source", "target"]:
+            continue
+        if len(row) != 2:
+            raise ValueError(f"expected source,target but got {row!r}")
+        yield row[0].strip(), row[1].strip()
+
+
+def group_by_source(pairs):
+    """
+    Returns a dict mapping each source to an (index, target) entry for
+    every pair queried from it, where index is the pair's position in
+    the input, so repeated pairs keep an entry each.
+    """
+    groups = {}
+    for index, (source, target) in enumerate(pairs):
+        groups.setdefault(source, []).append((index, target))
+    return groups
+
+
+def in_input_order(indexed_results):
+    """
+    Yields the results of (index, result) pairs in index order, each
+    as soon as every result before it has arrived.
+    """
+    waiting = {}
+    next_index = 0
+    for index, result in indexed_results:
+        waiting[index] = result
+        while next_index in waiting:
+            yield waiting.pop(next_index)
+            next_index += 1
+
+
+def run_queries(graph, pairs):
+    """
+    Answers an iterable of (source, target) person id pairs, running
+    one search per distinct source, and yields a result dict per pair
+    in input order.
+
+    Each result has the source, target, number of degrees and path,
+    with degrees and path None when the two are not connected, or an
+    error message if either id is unknown.
+    """
+    groups = group_by_source(pairs)
+    yield from in_input_order(
+        indexed for source, queries in groups.items()
+        for indexed in answer_source(graph, source, queries))
+
+
+def run_queries_parallel(directory, pairs, workers):
+    """
+    Like run_queries, but spreads the sources over a pool of worker
+    processes. Every worker maps the directory's snapshot rather than
+    receiving a pickled copy of the graph, so they all share its pages.
+    """
+    # Make sure a current snapshot exists before the workers open it;
+    # without one every worker would parse the CSV files itself
+    snapshot.build(directory)
+    groups = group_by_source(pairs)
+    chunksize = max(1, len(groups) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=attach, initargs=(directory,)) as executor:
+        yield from in_input_order(
+            indexed for results in executor.map(answer_in_worker, groups.items(), chunksize=chunksize)
+            for indexed in results)
+
+
+def attach(directory):
+    global worker_graph
+    worker_graph = snapshot.open_snapshot(directory)
+    if worker_graph is None:
+        raise RuntimeError(f"no up-to-date snapshot of {directory}")
+
+
+def answer_in_worker(group):
+    source, queries = group
+    return list(answer_source(worker_graph, source, queries))
+
+
+def answer_source(graph, source, queries):
+    """
+    Yields an (index, result dict) pair for each (index, target) query
+    of a source, from one search.
+    """
+    known = list({target: None for _, target in queries if target in graph.person_index})
+    if source not in graph.person_index:
+        known = []
+    paths = graph.shortest_paths(source, known) if known else {}
+
+    for index, target in queries:
+        result = {"source": source, "target": target}
+        if source not in graph.person_index:
+            result["error"] = f"unknown person id {source}"
+        elif target not in graph.person_index:
+            result["error"] = f"unknown person id {target}"
+        else:
+            path = paths[target]
+            result["degrees"] = None if path is None else len(path)
+            result["path"] = path
+        yield index, result
+
+
+def write_results(results, f):
+    """
+    Writes results to a file as JSON lines, one per query.
+    """
+    for result in results:
+        f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
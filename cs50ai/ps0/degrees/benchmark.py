@@ -0,0 +1,180 @@
+import argparse
+import contextlib
+import csv
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from itertools import accumulate
+
+import degrees
+import landmarks
+from graph import load_graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark degrees loaders and search strategies.")
+    parser.add_argument("--directory", help="benchmark an existing dataset instead of a generated one")
+    parser.add_argument("--people", type=int, default=20_000, help="people to generate (default: 20000)")
+    parser.add_argument("--movies", type=int, default=5_000, help="movies to generate (default: 5000)")
+    parser.add_argument("--cast", type=int, default=6, help="average stars per movie (default: 6)")
+    parser.add_argument("--skew", type=float, default=1.0,
+                        help="Zipf exponent of how often a person is cast, 0 for uniform (default: 1.0)")
+    parser.add_argument("--queries", type=int, default=50, help="queries per mix (default: 50)")
+    parser.add_argument("--landmarks", type=int, default=8, help="landmarks for the ALT search (default: 8)")
+    parser.add_argument("--seed", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.directory is not None:
+        run(args, args.directory)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            print(f"Generating {args.people:,} people, {args.movies:,} movies, skew {args.skew}...")
+            generate(directory, args.people, args.movies, args.cast, args.skew, args.seed)
+            run(args, directory)
+
+
+def generate(directory, people, movies, cast, skew=1.0, seed=None):
+    """
+    Writes people.csv, movies.csv and stars.csv for a random bipartite
+    actor/movie graph. Each movie gets a cast of 1 to 2 * `cast` - 1
+    people, picked with probability proportional to 1 / rank ** `skew`,
+    so a few people appear in many movies like real stars do.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, "people.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for person in range(people):
+            writer.writerow([person, f"Person {person}", rng.randint(1920, 2010)])
+
+    with open(os.path.join(directory, "movies.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "year"])
+        for movie in range(movies):
+            writer.writerow([movie, f"Movie {movie}", rng.randint(1930, 2020)])
+
+    weights = list(accumulate(1 / (rank + 1) ** skew for rank in range(people)))
+    with open(os.path.join(directory, "stars.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "movie_id"])
+        for movie in range(movies):
+            size = rng.randint(1, 2 * cast - 1)
+            for person in set(rng.choices(range(people), cum_weights=weights, k=size)):
+                writer.writerow([person, movie])
+
+
+def run(args, directory):
+    rng = random.Random(args.seed)
+
+    print("Loading...")
+    for name, load in (("load_data", load_dicts), ("load_graph", load_graph)):
+        seconds, peak, _ = measure(load, directory)
+        print(f"  {name:<12} {seconds:8.3f} s   peak {peak / 2 ** 20:8.1f} MiB")
+    load_dicts(directory)
+    graph = load_graph(directory)
+    index = landmarks.build_index(graph, args.landmarks)
+
+    # Each search, and how to read the number of people its most recent
+    # run expanded; every search resets its `expanded` count when it starts
+    strategies = {
+        "bfs": (degrees.shortest_path, lambda: degrees.expanded),
+        "bidirectional": (degrees.bidirectional_shortest_path, lambda: degrees.expanded),
+        "graph": (graph.shortest_path, lambda: graph.expanded),
+        "landmarks": (index.shortest_path, lambda: index.expanded),
+    }
+
+    for mix, pairs in query_mixes(graph, args.queries, rng).items():
+        if not pairs:
+            print(f"{mix}: no such pairs in this graph")
+            continue
+        print(f"{mix} ({len(pairs)} queries):")
+        print(f"  {'strategy':<14} {'p50 ms':>9} {'p99 ms':>9} {'expanded':>10} {'peak MiB':>9}")
+        for name, (search, expanded) in strategies.items():
+            latencies, nodes, peaks = [], [], []
+            for source, target in pairs:
+                seconds, peak, _ = measure(search, source, target)
+                latencies.append(seconds * 1000)
+                nodes.append(expanded())
+                peaks.append(peak)
+            print(f"  {name:<14} {percentile(latencies, 50):9.3f} {percentile(latencies, 99):9.3f} "
+                  f"{statistics.mean(nodes):10.1f} {max(peaks) / 2 ** 20:9.2f}")
+
+
+def load_dicts(directory):
+    """
+    Runs degrees.load_data from scratch, since it only ever adds to its dicts.
+    """
+    degrees.names.clear()
+    degrees.people.clear()
+    degrees.movies.clear()
+    degrees.load_data(directory)
+
+
+def query_mixes(graph, count, rng):
+    """
+    Returns up to `count` random (source, target) person id pairs for
+    each mix: any pair, pairs at most 2 apart, pairs at least 4 apart,
+    and pairs that are not connected at all.
+    """
+    mixes = {"random": [], "near": [], "far": [], "unreachable": []}
+    ids = graph.person_ids
+    for _ in range(count * 50):
+        if all(len(pairs) >= count for pairs in mixes.values()):
+            break
+        source = rng.randrange(len(ids))
+        distances = graph.distances_from(source)
+        for _ in range(10):
+            target = rng.randrange(len(ids))
+            if target == source:
+                continue
+            distance = distances[target]
+            if distance == -1:
+                mix = "unreachable"
+            elif distance <= 2:
+                mix = "near"
+            elif distance >= 4:
+                mix = "far"
+            else:
+                mix = None
+            pair = (ids[source], ids[target])
+            if len(mixes["random"]) < count:
+                mixes["random"].append(pair)
+            if mix is not None and len(mixes[mix]) < count:
+                mixes[mix].append(pair)
+    return mixes
+
+
+def measure(function, *args):
+    """
+    Calls a function twice and returns (seconds, peak bytes allocated,
+    result), with anything it prints discarded. Only the second call
+    traces allocations, so tracing does not slow down the timed one.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = function(*args)
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def percentile(values, p):
+    """
+    Returns the nearest-rank p-th percentile of a list of numbers.
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-p * len(ordered) // 100))
+    return ordered[int(rank) - 1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import time
+from collections import OrderedDict
+
+
+class PathCache():
+    """
+    Bounded least-recently-used cache of shortest paths.
+
+    Paths are symmetric, so each pair is stored once in a canonical
+    order and a query in the other direction gets the cached path
+    reversed. Entries older than `ttl` seconds, if given, are dropped.
+    """
+
+    def __init__(self, maxsize=4096, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        """
+        Drops every cached path, e.g. after the dataset is reloaded.
+        """
+        self.entries.clear()
+
+    def shortest_path(self, source, target, search):
+        """
+        Returns the cached path from source to target, calling
+        search(source, target) and caching its result on a miss.
+        """
+        key, forward = canonical(source, target)
+        entry = self.entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+            del self.entries[key]
+            entry = None
+
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            path = entry[0]
+        else:
+            self.misses += 1
+            path = search(*key)
+            self.entries[key] = (path, time.monotonic())
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+        return path if forward else reverse_path(key[0], path)
+
+
+def canonical(source, target):
+    """
+    Returns the cache key for a pair and whether it is in key order.
+    """
+    if source <= target:
+        return (source, target), True
+    return (target, source), False
+
+
+def reverse_path(source, path):
+    """
+    Turns a list of (movie_id, person_id) pairs leading away from
+    `source` into the pairs leading from its last person back to it.
+    """
+    if path is None:
+        return None
+    people = [source] + [person_id for _, person_id in path]
+    return [(path[i][0], people[i]) for i in range(len(path) - 1, -1, -1)]
@@ -1,6 +1,9 @@
-import csv
 import sys
 
+import snapshot
+from cache import PathCache
+from ingest import gc_paused, read_chunks
+from nameindex import NameIndex
 from util import Node, StackFrontier, QueueFrontier
 
 # Maps names to a set of corresponding person_ids
@@ -12,44 +15,59 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Prefix and fuzzy index over people's names, and the person_ids its
+# person indices refer to; exact lookups use names, so it is only
+# built by the first person_ids_like_name after load_data
+name_index = None
+indexed_ids = []
+
+expanded = 0
+
+# Recently found paths, cleared whenever the data is reloaded
+path_cache = PathCache()
+
 
 def load_data(directory):
     """
     Load data from CSV files into memory.
     """
-    # Load people
-    with open(f"{directory}/people.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
-
-    # Load movies
-    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
-
-    # Load stars
-    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
-                pass
+    path_cache.clear()
+
+    with gc_paused():
+        # Load people
+        for chunk in read_chunks(f"{directory}/people.csv", ("id", "name", "birth")):
+            for person_id, name, birth in chunk:
+                people[person_id] = {
+                    "name": name,
+                    "birth": birth,
+                    "movies": set()
+                }
+                if name.lower() not in names:
+                    names[name.lower()] = {person_id}
+                else:
+                    names[name.lower()].add(person_id)
+
+        # Load movies
+        for chunk in read_chunks(f"{directory}/movies.csv", ("id", "title", "year")):
+            for movie_id, title, year in chunk:
+                movies[movie_id] = {
+                    "title": title,
+                    "year": year,
+                    "stars": set()
+                }
+
+        # Load stars
+        for chunk in read_chunks(f"{directory}/stars.csv", ("person_id", "movie_id")):
+            for person_id, movie_id in chunk:
+                try:
+                    people[person_id]["movies"].add(movie_id)
+                    movies[movie_id]["stars"].add(person_id)
+                except KeyError:
+                    pass
+
+    # The name index no longer matches the data
+    global name_index
+    name_index = None
 
 
 def main():
@@ -57,22 +75,23 @@ def main():
         sys.exit("Usage: python degrees.py [directory]")
     directory = sys.argv[1] if len(sys.argv) == 2 else "large"
 
-    # Load data from files into memory
+    # Load data from the snapshot, parsing the CSV files only when it is stale
     print("Loading data...")
-    load_data(directory)
+    graph = snapshot.load(directory, progress=sys.stdout)
+    path_cache.clear()
     print("Data loaded.")
 
     while True:
-        source = person_id_for_name(input("Name: "))
+        source = person_id_for_name(input("Name: "), graph)
         if source is None:
             print('Person not found, try again: ')
-            source = person_id_for_name(input("Name: "))
-        target = person_id_for_name(input("Name: "))
+            source = person_id_for_name(input("Name: "), graph)
+        target = person_id_for_name(input("Name: "), graph)
         if target is None:
             print('Person not found, try again: ')
-            target = person_id_for_name(input("Name: "))
+            target = person_id_for_name(input("Name: "), graph)
 
-        path = shortest_path(source, target)
+        path = path_cache.shortest_path(source, target, graph.shortest_path)
 
         if path is None:
             print("Not connected.")
@@ -81,9 +100,9 @@ def main():
             print(f"{degrees} degrees of separation.")
             path = [(None, source)] + path
             for i in range(degrees):
-                person1 = people[path[i][1]]["name"]
-                person2 = people[path[i + 1][1]]["name"]
-                movie = movies[path[i + 1][0]]["title"]
+                person1 = graph.person(path[i][1])["name"]
+                person2 = graph.person(path[i + 1][1])["name"]
+                movie = graph.movie(path[i + 1][0])["title"]
                 print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
@@ -95,6 +114,9 @@ def shortest_path(source, target):
     If no possible path, returns None.
     """
 
+    global expanded
+    expanded = 0
+
     # TODO
     # The persons will be analogous to the state and movie is analogous to the action
     # We start with the source node
@@ -113,6 +135,7 @@ def shortest_path(source, target):
         # get the current node from frontier
         current_node = frontier.remove() 
         explored.add(current_node.state)          
+        expanded += 1
         for movie in people[current_node.state]['movies']:
             for person in movies[movie]['stars']:         
                 if not frontier.contains_state(person) and person not in explored:
@@ -129,18 +152,115 @@ def shortest_path(source, target):
                     child_node = Node(state = person, parent = current_node, action = movie)
                     frontier.add(child_node)        
 
-def person_id_for_name(name):
+def cached_shortest_path(source, target):
+    """
+    Returns shortest_path(source, target), answering repeated
+    queries in either direction from the path cache.
+    """
+    return path_cache.shortest_path(source, target, shortest_path)
+
+
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching from both
+    ends at once and always expanding the smaller frontier.
+
+    If no possible path, returns None.
+    """
+    global expanded
+    expanded = 0
+    if source == target:
+        return []
+
+    # Each side maps a reached person to the (movie_id, person_id) step
+    # that reached it, and to its distance from that side's start
+    parents = ({source: None}, {target: None})
+    distances = ({source: 0}, {target: 0})
+    frontiers = ([source], [target])
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        other = 1 - side
+        next_frontier = []
+        best = None
+
+        # Expand one whole level so the meeting point found is the closest
+        for person_id in frontiers[side]:
+            expanded += 1
+            depth = distances[side][person_id] + 1
+            for movie_id, neighbor in neighbors_for_person(person_id):
+                if neighbor in parents[side]:
+                    continue
+                parents[side][neighbor] = (movie_id, person_id)
+                distances[side][neighbor] = depth
+                next_frontier.append(neighbor)
+                if neighbor in parents[other]:
+                    total = depth + distances[other][neighbor]
+                    if best is None or total < best[0]:
+                        best = (total, neighbor)
+
+        if best is not None:
+            return _join_paths(parents[0], parents[1], best[1])
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+
+    return None
+
+
+def _join_paths(forward, backward, meeting):
+    """
+    Builds the source-to-target path through the person where
+    the forward and backward searches met.
+    """
+    path = []
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, parent = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent
+    path.reverse()
+
+    # Steps on the backward side point towards the target, so each
+    # movie links the current person to the next one along the path
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, child = backward[person_id]
+        path.append((movie_id, child))
+        person_id = child
+    return path
+
+
+def person_id_for_name(name, graph=None):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    Looks the name up in `graph` if one is given,
+    otherwise in the data loaded by load_data. If no one
+    has exactly that name, offers people whose name starts
+    with it or is spelled similarly instead, and asks which
+    one is meant even if only one person is offered.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    if graph is None:
+        person_ids = list(names.get(name.lower(), set()))
+        person_for_id = people.__getitem__
+    else:
+        person_ids = graph.person_ids_for_name(name)
+        person_for_id = graph.person
+    question = f"Which '{name}'?"
+    exact = len(person_ids) > 0
+    if not exact:
+        if graph is None:
+            person_ids = person_ids_like_name(name)
+        else:
+            person_ids = graph.person_ids_like_name(name)
+        question = f"No exact match for '{name}'. Did you mean:"
     if len(person_ids) == 0:
         return None
-    elif len(person_ids) > 1:
-        print(f"Which '{name}'?")
+    elif len(person_ids) > 1 or not exact:
+        print(question)
         for person_id in person_ids:
-            person = people[person_id]
+            person = person_for_id(person_id)
             name = person["name"]
             birth = person["birth"]
             print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
@@ -155,6 +275,19 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def person_ids_like_name(name, limit=10):
+    """
+    Returns the ids of people whose name starts with `name`, or
+    failing that whose name is most similar to it.
+    """
+    global name_index, indexed_ids
+    if name_index is None:
+        indexed_ids = list(people)
+        name_index = NameIndex.build([people[person_id]["name"] for person_id in indexed_ids])
+    matches = name_index.prefix(name, limit) or name_index.fuzzy(name, limit)
+    return [indexed_ids[i] for i in matches]
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
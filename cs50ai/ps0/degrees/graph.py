@@ -0,0 +1,340 @@
+import bisect
+import itertools
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+
+from ingest import gc_paused, read_chunks, read_table
+from nameindex import NameIndex
+
+
+class Graph():
+    """
+    Compact store of the person-movie bipartite graph.
+
+    People and movies are interned to dense integer indices and the
+    star relation is kept in CSR form: the movies of person `i` are
+    person_movies[person_offsets[i]:person_offsets[i + 1]], and the
+    stars of movie `m` are movie_stars[movie_offsets[m]:movie_offsets[m + 1]].
+    """
+
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_stars,
+                 person_index=None, movie_index=None, name_index=None):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+        # Lookups given up front replace the ones built on first use
+        if person_index is not None:
+            self.person_index = person_index
+        if movie_index is not None:
+            self.movie_index = movie_index
+        if name_index is not None:
+            self.name_index = name_index
+
+        self.expanded = 0
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    # The id and name lookups are built on first use, so that a graph
+    # opened from a snapshot is ready before any dict has been filled
+
+    @cached_property
+    def person_index(self):
+        return {person_id: i for i, person_id in enumerate(self.person_ids)}
+
+    @cached_property
+    def movie_index(self):
+        return {movie_id: i for i, movie_id in enumerate(self.movie_ids)}
+
+    @cached_property
+    def name_index(self):
+        return NameIndex.build(self.person_names)
+
+    def person_ids_for_name(self, name):
+        """
+        Returns the ids of every person with a given name, ignoring case.
+        """
+        return [self.person_ids[i] for i in self.name_index.exact(name)]
+
+    def person_ids_like_name(self, name, limit=10):
+        """
+        Returns the ids of people whose name starts with `name`, or
+        failing that whose name is most similar to it, for resolving
+        partial or misspelled names.
+        """
+        matches = self.name_index.prefix(name, limit) or self.name_index.fuzzy(name, limit)
+        return [self.person_ids[i] for i in matches]
+
+    def person(self, person_id):
+        """
+        Returns the name and birth year of a person id.
+        """
+        i = self.person_index[person_id]
+        return {"name": self.person_names[i], "birth": self.person_births[i]}
+
+    def movie(self, movie_id):
+        """
+        Returns the title and year of a movie id.
+        """
+        i = self.movie_index[movie_id]
+        return {"title": self.movie_titles[i], "year": self.movie_years[i]}
+
+    def movies_of(self, person):
+        """
+        Returns the movie indices a person index starred in.
+        """
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_of(self, movie):
+        """
+        Returns the person indices that starred in a movie index.
+        """
+        return self.movie_stars[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        neighbors = set()
+        for movie in self.movies_of(self.person_index[person_id]):
+            movie_id = self.movie_ids[movie]
+            for star in self.stars_of(movie):
+                neighbors.add((movie_id, self.person_ids[star]))
+        return neighbors
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        If no possible path, returns None.
+        """
+        return self.shortest_paths(source, [target])[target]
+
+    def shortest_paths(self, source, targets):
+        """
+        Returns a dict mapping each target to the shortest list of
+        (movie_id, person_id) pairs that connects the source to it,
+        or to None if it cannot be reached, using a single search.
+        """
+        source = self.person_index[source]
+        wanted = {self.person_index[target] for target in targets}
+        parent_person, parent_movie = self.search_tree(source, wanted)
+        paths = {}
+        for target in targets:
+            person = self.person_index[target]
+            if parent_person[person] == -1:
+                paths[target] = None
+            else:
+                paths[target] = self._path_to(person, parent_person, parent_movie)
+        return paths
+
+    def search_tree(self, source, targets=None):
+        """
+        Runs a breadth-first search from a person index and returns its
+        (parent_person, parent_movie) arrays, where -1 marks unreached
+        people and the source is its own parent.
+
+        If a set of target indices is given, the search stops as soon
+        as all of them have been reached.
+        """
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_stars = self.movie_stars
+
+        parent_person = array("i", [-1]) * len(self.person_ids)
+        parent_movie = array("i", [-1]) * len(self.person_ids)
+        # A movie joins all its stars at once, so it never needs a second scan
+        seen_movies = bytearray(len(self.movie_ids))
+        parent_person[source] = source
+        remaining = None if targets is None else set(targets) - {source}
+        self.expanded = 0
+        if remaining is not None and not remaining:
+            return parent_person, parent_movie
+        frontier = [source]
+
+        while frontier:
+            next_frontier = []
+            for person in frontier:
+                self.expanded += 1
+                for i in range(person_offsets[person], person_offsets[person + 1]):
+                    movie = person_movies[i]
+                    if seen_movies[movie]:
+                        continue
+                    seen_movies[movie] = 1
+                    for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                        star = movie_stars[j]
+                        if parent_person[star] != -1:
+                            continue
+                        parent_person[star] = person
+                        parent_movie[star] = movie
+                        next_frontier.append(star)
+                        if remaining is not None and star in remaining:
+                            remaining.discard(star)
+                            if not remaining:
+                                return parent_person, parent_movie
+            frontier = next_frontier
+
+        return parent_person, parent_movie
+
+    def distances_from(self, source):
+        """
+        Returns an array holding the number of degrees of separation
+        between a person index and every person, or -1 if unreachable.
+        """
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_stars = self.movie_stars
+
+        distances = array("i", [-1]) * len(self.person_ids)
+        seen_movies = bytearray(len(self.movie_ids))
+        distances[source] = 0
+        frontier = [source]
+        depth = 0
+
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for person in frontier:
+                for i in range(person_offsets[person], person_offsets[person + 1]):
+                    movie = person_movies[i]
+                    if seen_movies[movie]:
+                        continue
+                    seen_movies[movie] = 1
+                    for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                        star = movie_stars[j]
+                        if distances[star] == -1:
+                            distances[star] = depth
+                            next_frontier.append(star)
+            frontier = next_frontier
+
+        return distances
+
+    def _path_to(self, person, parent_person, parent_movie):
+        """
+        Follows parent links back to the root of a search tree and
+        returns the (movie_id, person_id) pairs leading to `person`.
+        """
+        path = []
+        while parent_person[person] != person:
+            path.append((self.movie_ids[parent_movie[person]], self.person_ids[person]))
+            person = parent_person[person]
+        path.reverse()
+        return path
+
+
+class SortedIndex(Mapping):
+    """
+    Read-only mapping from ids to their indices, found by binary search
+    over a permutation that lists the indices in id order.
+
+    Unlike a dict it costs nothing to open, so a snapshot can store the
+    permutation and every process mapping it shares the same lookup.
+    """
+
+    def __init__(self, ids, order):
+        self.ids = ids
+        self.order = order
+        self.sorted_ids = SortedView(ids, order)
+
+    def __getitem__(self, key):
+        k = bisect.bisect_left(self.sorted_ids, key)
+        if k < len(self.order) and self.sorted_ids[k] == key:
+            return self.order[k]
+        raise KeyError(key)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __iter__(self):
+        return iter(self.sorted_ids)
+
+
+class SortedView():
+    """
+    Sequence of ids in sorted order, for bisect to search.
+    """
+
+    def __init__(self, ids, order):
+        self.ids = ids
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, k):
+        return self.ids[self.order[k]]
+
+
+def sorted_order(ids):
+    """
+    Returns the permutation listing the indices of ids in id order.
+    """
+    return array("i", sorted(range(len(ids)), key=ids.__getitem__))
+
+
+def load_graph(directory, progress=None):
+    """
+    Load data from CSV files into a compact Graph.
+
+    If a stream is given as `progress`, each file's rows per second
+    are reported to it while loading.
+    """
+    with gc_paused():
+        # Load people and movies side by side; they do not depend on each other
+        with ThreadPoolExecutor(2) as executor:
+            people = executor.submit(read_table, f"{directory}/people.csv",
+                                     ("id", "name", "birth"), progress)
+            movies = executor.submit(read_table, f"{directory}/movies.csv",
+                                     ("id", "title", "year"), progress)
+            person_ids, person_names, person_births = people.result()
+            movie_ids, movie_titles, movie_years = movies.result()
+
+        # Resolve stars a chunk at a time, skipping unknown ids like
+        # load_data. Each edge is kept as one int, person * movie_count +
+        # movie, so a set drops repeated pairs
+        person_index = dict(zip(person_ids, range(len(person_ids))))
+        movie_index = dict(zip(movie_ids, range(len(movie_ids))))
+        person_count, movie_count = len(person_ids), len(movie_ids)
+        edges = set()
+        for chunk in read_chunks(f"{directory}/stars.csv", ("person_id", "movie_id"), progress):
+            edges.update([person_index[person_id] * movie_count + movie_index[movie_id]
+                          for person_id, movie_id in chunk
+                          if person_id in person_index and movie_id in movie_index])
+
+        # Group the edges by person and by movie
+        movies_of = [[] for _ in range(person_count)]
+        stars_of = [[] for _ in range(movie_count)]
+        for person, movie in map(divmod, edges, itertools.repeat(movie_count)):
+            movies_of[person].append(movie)
+            stars_of[movie].append(person)
+        person_offsets, person_movies = to_csr(movies_of)
+        movie_offsets, movie_stars = to_csr(stars_of)
+    return Graph(person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_stars,
+                 person_index, movie_index)
+
+
+def to_csr(groups):
+    """
+    Returns the (offsets, targets) arrays of the CSR form of a list
+    holding the targets of each source.
+    """
+    offsets = array("q", itertools.accumulate(map(len, groups), initial=0))
+    targets = array("i", itertools.chain.from_iterable(groups))
+    return offsets, targets
@@ -0,0 +1,109 @@
+import contextlib
+import csv
+import gc
+import itertools
+import operator
+import time
+
+# Rows parsed per chunk; large enough to amortise the per-chunk work
+CHUNK_SIZE = 50_000
+
+
+class Progress():
+    """
+    Reports how many rows of a file have been read and how fast,
+    at most once every `interval` seconds and once when finished.
+    """
+
+    def __init__(self, name, stream, interval=1.0):
+        self.name = name
+        self.stream = stream
+        self.interval = interval
+        self.rows = 0
+        self.start = self.last = time.perf_counter()
+
+    def update(self, rows):
+        self.rows += rows
+        now = time.perf_counter()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.report(now)
+
+    def finish(self):
+        self.report(time.perf_counter(), done=True)
+
+    def report(self, now, done=False):
+        elapsed = now - self.start
+        rate = self.rows / elapsed if elapsed > 0 else 0
+        status = "done" if done else "reading"
+        print(f"{self.name}: {status}, {self.rows:,} rows ({rate:,.0f} rows/sec)",
+              file=self.stream, flush=True)
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """
+    Pauses the cyclic garbage collector for a bulk load.
+
+    Loading allocates millions of tuples and lists that all stay alive,
+    so every collection rescans them for nothing; without the pause the
+    collector takes about two thirds of the load time. Nothing loaded
+    forms a cycle, so reference counting still frees everything.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def read_chunks(path, columns, progress=None, chunk_size=CHUNK_SIZE):
+    """
+    Yields lists of rows holding the named columns of a CSV file,
+    `chunk_size` rows at a time, skipping blank lines. Rows are tuples,
+    or the reader's own lists when every column is asked for in order.
+
+    Columns are looked up once in the header and picked out by index,
+    which is much cheaper than building a dict per row. If a stream is
+    given as `progress`, rows per second are reported to it.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        indices = [header.index(column) for column in columns]
+        if indices == list(range(len(header))):
+            # Every column, in order, so the rows can be used as they are
+            pick = None
+        elif len(columns) == 1:
+            single = operator.itemgetter(indices[0])
+            pick = lambda row: (single(row),)
+        else:
+            pick = operator.itemgetter(*indices)
+        reporter = None if progress is None else Progress(path, progress)
+
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                break
+            if reporter is not None:
+                reporter.update(len(rows))
+            if pick is None:
+                yield list(filter(None, rows))
+            else:
+                yield [pick(row) for row in rows if row]
+
+        if reporter is not None:
+            reporter.finish()
+
+
+def read_table(path, columns, progress=None):
+    """
+    Reads the named columns of a CSV file into one list per column.
+    """
+    table = tuple([] for _ in columns)
+    for chunk in read_chunks(path, columns, progress):
+        for values, column in zip(table, zip(*chunk)):
+            values.extend(column)
+    return table
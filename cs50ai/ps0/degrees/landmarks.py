@@ -0,0 +1,197 @@
+import heapq
+import json
+import math
+import os
+import sys
+from array import array
+
+import snapshot
+
+
+class LandmarkIndex():
+    """
+    Degrees of separation from a few landmark people to everyone.
+
+    By the triangle inequality, for every landmark L the distance
+    between s and t is at least |d(L, s) - d(L, t)| and at most
+    d(L, s) + d(L, t), which bounds any query with a few array lookups.
+    """
+
+    def __init__(self, graph, landmarks, distances):
+        self.graph = graph
+        self.landmarks = landmarks
+        # distances[k] is the distance array of landmark k, -1 if unreachable
+        self.distances = distances
+        self.expanded = 0
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation
+        between two person ids. The lower bound is math.inf if the
+        landmarks prove the two are not connected, and the upper
+        bound is math.inf if no landmark reaches both of them.
+        """
+        return self._bounds(self.graph.person_index[source], self.graph.person_index[target])
+
+    def _bounds(self, source, target):
+        if source == target:
+            return 0, 0
+        lower, upper = 0, math.inf
+        for distances in self.distances:
+            from_source, from_target = distances[source], distances[target]
+            if from_source == -1 and from_target == -1:
+                continue
+            if from_source == -1 or from_target == -1:
+                # A landmark reaches exactly one of them: different components
+                return math.inf, math.inf
+            lower = max(lower, abs(from_source - from_target))
+            upper = min(upper, from_source + from_target)
+        return lower, upper
+
+    def lower_bound(self, person, target):
+        """
+        Returns a lower bound on the distance between two person
+        indices, using only the landmarks that reach the target.
+        """
+        lower = 0
+        for distances in self.distances:
+            from_target = distances[target]
+            if from_target != -1:
+                lower = max(lower, abs(distances[person] - from_target))
+        return lower
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        If no possible path, returns None.
+
+        Disconnected pairs are answered from the index alone, and the
+        search skips anyone whose depth plus lower bound to the target
+        exceeds the landmark upper bound on the whole path.
+        """
+        graph = self.graph
+        source_index = graph.person_index[source]
+        target_index = graph.person_index[target]
+        lower, upper = self._bounds(source_index, target_index)
+        self.expanded = 0
+        if lower == math.inf:
+            return None
+        if source_index == target_index:
+            return []
+
+        # Expanding people by depth plus lower bound reaches the target
+        # along a shortest path first, like A* with an admissible heuristic;
+        # among equal estimates the deepest person goes first
+        parent_person = array("i", [-1]) * len(graph)
+        parent_movie = array("i", [-1]) * len(graph)
+        depths = {source_index: 0}
+        parent_person[source_index] = source_index
+        queue = [(lower, 0, source_index)]
+        closed = set()
+
+        while queue:
+            _, negative_depth, person = heapq.heappop(queue)
+            depth = -negative_depth
+            if person in closed:
+                continue
+            if person == target_index:
+                return graph._path_to(person, parent_person, parent_movie)
+            closed.add(person)
+            self.expanded += 1
+            for movie in graph.movies_of(person):
+                for star in graph.stars_of(movie):
+                    if star in closed or depths.get(star, math.inf) <= depth + 1:
+                        continue
+                    estimate = depth + 1 + self.lower_bound(star, target_index)
+                    if estimate > upper:
+                        continue
+                    depths[star] = depth + 1
+                    parent_person[star] = person
+                    parent_movie[star] = movie
+                    heapq.heappush(queue, (estimate, -depth - 1, star))
+
+        return None
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python landmarks.py directory [count]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else 16
+
+    graph = snapshot.load(directory)
+    print(f"Building index from {count} landmarks...")
+    index = build_index(graph, count)
+    save_index(directory, index)
+    names = ", ".join(graph.person_names[landmark] for landmark in index.landmarks)
+    print(f"Index saved. Landmarks: {names}")
+
+
+def build_index(graph, count):
+    """
+    Runs a breadth-first search from each of the `count` people with
+    the most co-stars and returns their distances as a LandmarkIndex.
+    """
+    landmarks = heapq.nlargest(min(count, len(graph)), range(len(graph)),
+                               key=lambda person: co_star_count(graph, person))
+    distances = [graph.distances_from(landmark) for landmark in landmarks]
+    return LandmarkIndex(graph, landmarks, distances)
+
+
+def co_star_count(graph, person):
+    """
+    Returns how many co-star slots a person index has, counting a
+    co-star once per shared movie.
+    """
+    offsets = graph.movie_offsets
+    return sum(offsets[movie + 1] - offsets[movie] - 1 for movie in graph.movies_of(person))
+
+
+def index_files(directory):
+    path = snapshot.snapshot_path(directory)
+    return path, os.path.join(path, "landmarks.json")
+
+
+def save_index(directory, index):
+    """
+    Writes a LandmarkIndex into the snapshot of a data directory.
+    """
+    path, manifest_file = index_files(directory)
+    os.makedirs(path, exist_ok=True)
+    table = array("i")
+    for distances in index.distances:
+        table.extend(distances)
+    snapshot.write_file(path, "landmarks.bin", table)
+
+    manifest = snapshot.manifest_for(directory)
+    manifest["landmarks"] = list(index.landmarks)
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def load_index(directory, graph):
+    """
+    Memory-maps the LandmarkIndex saved for a data directory.
+
+    Returns None if there is no index or the CSV files have changed since.
+    """
+    path, manifest_file = index_files(directory)
+    try:
+        with open(manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    landmarks = manifest.pop("landmarks", None)
+    if landmarks is None or manifest != snapshot.manifest_for(directory):
+        return None
+
+    table = snapshot.map_file(path, "landmarks.bin", "i")
+    size = len(graph)
+    distances = [table[k * size:(k + 1) * size] for k in range(len(landmarks))]
+    return LandmarkIndex(graph, landmarks, distances)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import bisect
+import heapq
+import math
+from array import array
+from collections import Counter
+from functools import cached_property
+
+# Fuzzy matches need at least this Jaccard similarity of trigram sets
+MIN_SIMILARITY = 0.5
+
+# Fuzzy lookups scan the postings of the query's rarest trigrams for
+# candidates, up to this share of the names in all; common trigrams,
+# like "on ", say little about a name and are only probed
+SCAN_SHARE = 0.01
+
+# Checking one name against a posting by binary search costs about as
+# much as scanning this many of its entries
+PROBE_COST = 16
+
+
+class NameIndex():
+    """
+    Case-insensitive index of person names.
+
+    Distinct lowercased names are kept sorted along with the people
+    having each, so exact and prefix lookups are binary searches. Fuzzy
+    matching uses trigram postings, which are only built on the first
+    fuzzy lookup unless given. Lookups return person indices, i.e.
+    positions in the sequence of names the index was built from.
+    """
+
+    def __init__(self, keys, offsets, people, postings=None):
+        self.keys = keys
+        # The people with keys[k] are people[offsets[k]:offsets[k + 1]]
+        self.offsets = offsets
+        self.people = people
+        if postings is not None:
+            self.postings = postings
+
+    @classmethod
+    def build(cls, names):
+        """
+        Returns the index of a sequence of names, where names[i] is
+        the name of person i.
+        """
+        by_key = {}
+        for person, name in enumerate(names):
+            by_key.setdefault(name.lower(), []).append(person)
+
+        keys = sorted(by_key)
+        offsets = array("q", [0])
+        people = array("i")
+        for key in keys:
+            people.extend(by_key[key])
+            offsets.append(len(people))
+        return cls(keys, offsets, people)
+
+    @cached_property
+    def postings(self):
+        return Postings.build(self.keys)
+
+    def _people(self, k):
+        return list(self.people[self.offsets[k]:self.offsets[k + 1]])
+
+    def exact(self, name):
+        """
+        Returns the indices of the people with exactly this name.
+        """
+        key = name.lower()
+        k = bisect.bisect_left(self.keys, key)
+        if k < len(self.keys) and self.keys[k] == key:
+            return self._people(k)
+        return []
+
+    def prefix(self, prefix, limit=None):
+        """
+        Returns the indices of people whose name starts with `prefix`,
+        in name order, stopping after `limit` distinct names if given.
+        """
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.keys, prefix)
+        # Every key with the prefix sorts before prefix + the largest code point
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", start)
+        if limit is not None:
+            end = min(end, start + limit)
+        matches = []
+        for k in range(start, end):
+            matches.extend(self._people(k))
+        return matches
+
+    def fuzzy(self, name, limit=10, min_similarity=MIN_SIMILARITY):
+        """
+        Returns the indices of people with the `limit` distinct names
+        most similar to `name`, best first, ranking names by the
+        Jaccard similarity of their trigram sets and leaving out
+        names less similar than `min_similarity`.
+        """
+        query = trigrams(name.lower())
+        postings = self.postings
+        spans = sorted((postings.span(gram) for gram in query), key=lambda span: span[1] - span[0])
+
+        # A name similar enough shares at least `needed` trigrams with the
+        # query. The rarest postings are scanned for candidates, up to a
+        # budget, and the rest only probed for the candidates; so names
+        # sharing nothing but common trigrams with the query are missed
+        needed = max(1, math.ceil(min_similarity * len(query)))
+        budget = max(1, int(SCAN_SHARE * len(self.keys)))
+        counts = Counter()
+        scanned = 0
+        for start, end in spans:
+            if end - start > budget:
+                break
+            counts.update(postings.entries[start:end])
+            scanned += 1
+            budget -= end - start
+        probed = spans[scanned:]
+
+        # Drop each candidate once it can no longer share enough trigrams
+        for i, (start, end) in enumerate(probed):
+            at_least = needed - (len(probed) - i)
+            if at_least > 1:
+                counts = Counter({k: count for k, count in counts.items() if count >= at_least})
+            if len(counts) * PROBE_COST < end - start:
+                counts.update([k for k in counts if postings.contains(start, end, k)])
+            else:
+                counts.update(counts.keys() & postings.entries[start:end])
+
+        scored = []
+        for k, shared in counts.items():
+            similarity = shared / (len(query) + postings.sizes[k] - shared)
+            if similarity >= min_similarity:
+                scored.append((-similarity, self.keys[k], k))
+
+        matches = []
+        for _, _, k in heapq.nsmallest(limit, scored):
+            matches.extend(self._people(k))
+        return matches
+
+
+class Postings():
+    """
+    The names containing each trigram, by their position in the sorted
+    keys: trigram grams[g] is in keys entries[offsets[g]:offsets[g + 1]],
+    and keys[k] has sizes[k] distinct trigrams.
+    """
+
+    def __init__(self, grams, offsets, entries, sizes):
+        self.grams = grams
+        self.offsets = offsets
+        self.entries = entries
+        self.sizes = sizes
+
+    @classmethod
+    def build(cls, keys):
+        lists = {}
+        sizes = array("i")
+        for k, key in enumerate(keys):
+            grams = trigrams(key)
+            for gram in grams:
+                lists.setdefault(gram, []).append(k)
+            sizes.append(len(grams))
+
+        grams = sorted(lists)
+        offsets = array("q", [0])
+        entries = array("i")
+        for gram in grams:
+            entries.extend(lists[gram])
+            offsets.append(len(entries))
+        return cls(grams, offsets, entries, sizes)
+
+    def span(self, gram):
+        """
+        Returns the (start, end) range of entries listing a trigram's names.
+        """
+        g = bisect.bisect_left(self.grams, gram)
+        if g < len(self.grams) and self.grams[g] == gram:
+            return self.offsets[g], self.offsets[g + 1]
+        return 0, 0
+
+    def contains(self, start, end, k):
+        """
+        Returns whether key k is in entries[start:end], which is sorted.
+        """
+        i = bisect.bisect_left(self.entries, k, start, end)
+        return i < end and self.entries[i] == k
+
+
+def trigrams(key):
+    """
+    Returns the set of three-character substrings of a padded name,
+    so that the start and end of the name count for more.
+    """
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
@@ -0,0 +1,209 @@
+import json
+import mmap
+import os
+import sys
+from array import array
+
+from graph import Graph, SortedIndex, load_graph, sorted_order
+from nameindex import NameIndex, Postings
+
+# Bump whenever the on-disk layout changes so stale snapshots are rebuilt
+VERSION = 3
+
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+STRINGS = ("person_ids", "person_names", "person_births",
+           "movie_ids", "movie_titles", "movie_years")
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_stars")
+# Id lookup tables: the string table they search and the file holding its order
+ORDERS = {"person_index": ("person_ids", "person_order"),
+          "movie_index": ("movie_ids", "movie_order")}
+
+
+class StringTable():
+    """
+    Read-only sequence of strings stored as one UTF-8 blob and an
+    array of offsets, decoding each entry only when it is accessed.
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("string table index out of range")
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def snapshot_path(directory):
+    return os.path.join(directory, ".snapshot")
+
+
+def source_key(directory):
+    """
+    Returns the mtimes and sizes of the CSV files a snapshot was built from.
+    """
+    key = {}
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        key[name] = [stat.st_mtime_ns, stat.st_size]
+    return key
+
+
+def manifest_for(directory):
+    return {
+        "version": VERSION,
+        "byteorder": sys.byteorder,
+        "sources": source_key(directory),
+    }
+
+
+def load(directory, progress=None):
+    """
+    Returns the Graph for a data directory, opening its snapshot if it
+    is up to date and otherwise parsing the CSV files and writing one.
+
+    Parsing progress is reported to the `progress` stream, if given.
+    """
+    graph = open_snapshot(directory)
+    if graph is None:
+        graph = load_graph(directory, progress)
+        try:
+            write_snapshot(directory, graph)
+        except OSError:
+            # A read-only data directory just means every start parses the CSVs
+            pass
+    return graph
+
+
+def build(directory, progress=None):
+    """
+    Makes sure a data directory has an up-to-date snapshot, parsing
+    the CSV files if needed. Unlike load, raises OSError if the
+    snapshot cannot be written.
+    """
+    if open_snapshot(directory) is None:
+        write_snapshot(directory, load_graph(directory, progress))
+
+
+def open_snapshot(directory):
+    """
+    Memory-maps the snapshot of a data directory into a Graph.
+
+    Returns None if there is no snapshot or it no longer matches the CSV files.
+    """
+    path = snapshot_path(directory)
+    try:
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    typecodes = manifest.pop("typecodes", None)
+    if typecodes is None or manifest != manifest_for(directory):
+        return None
+
+    fields = {}
+    for name in STRINGS:
+        fields[name] = map_strings(path, name)
+    for name in ARRAYS:
+        fields[name] = map_file(path, f"{name}.bin", typecodes[name])
+    for name, (ids, order) in ORDERS.items():
+        fields[name] = SortedIndex(fields[ids], map_file(path, f"{order}.bin", "i"))
+    postings = Postings(map_strings(path, "name_grams"),
+                        map_file(path, "name_gram_offsets.bin", "q"),
+                        map_file(path, "name_gram_entries.bin", "i"),
+                        map_file(path, "name_gram_sizes.bin", "i"))
+    fields["name_index"] = NameIndex(map_strings(path, "name_keys"),
+                                     map_file(path, "name_offsets.bin", "q"),
+                                     map_file(path, "name_people.bin", "i"),
+                                     postings)
+    return Graph(**fields)
+
+
+def write_snapshot(directory, graph):
+    """
+    Writes the arrays and string tables of a Graph next to its CSV files.
+    """
+    path = snapshot_path(directory)
+    os.makedirs(path, exist_ok=True)
+
+    # The manifest goes last, so an interrupted write is never opened
+    manifest_file = os.path.join(path, "manifest.json")
+    if os.path.exists(manifest_file):
+        os.remove(manifest_file)
+
+    for name in STRINGS:
+        write_strings(path, name, getattr(graph, name))
+
+    typecodes = {}
+    for name in ARRAYS:
+        values = getattr(graph, name)
+        typecodes[name] = values.typecode if hasattr(values, "typecode") else values.format
+        write_file(path, f"{name}.bin", memoryview(values).cast("B"))
+    for ids, order in ORDERS.values():
+        write_file(path, f"{order}.bin", sorted_order(getattr(graph, ids)))
+
+    # The name index, so exact and fuzzy name lookups need no building
+    index = graph.name_index
+    write_strings(path, "name_keys", index.keys)
+    write_file(path, "name_offsets.bin", array("q", index.offsets))
+    write_file(path, "name_people.bin", array("i", index.people))
+    write_strings(path, "name_grams", index.postings.grams)
+    write_file(path, "name_gram_offsets.bin", array("q", index.postings.offsets))
+    write_file(path, "name_gram_entries.bin", array("i", index.postings.entries))
+    write_file(path, "name_gram_sizes.bin", array("i", index.postings.sizes))
+
+    manifest = manifest_for(directory)
+    manifest["typecodes"] = typecodes
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def write_strings(path, name, strings):
+    """
+    Writes a sequence of strings as the blob and offsets of a StringTable.
+    """
+    blob = bytearray()
+    offsets = [0]
+    for string in strings:
+        blob += string.encode("utf-8")
+        offsets.append(len(blob))
+    write_file(path, f"{name}.str", blob)
+    write_file(path, f"{name}.idx", array("q", offsets))
+
+
+def map_strings(path, name):
+    return StringTable(map_file(path, f"{name}.str", "B"), map_file(path, f"{name}.idx", "q"))
+
+
+def write_file(path, name, data):
+    """
+    Replaces a snapshot file atomically, so processes that still have
+    the old file mapped keep reading the old contents.
+    """
+    temp = os.path.join(path, f"{name}.tmp")
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, os.path.join(path, name))
+
+
+def map_file(path, name, typecode):
+    """
+    Returns a read-only memoryview of a snapshot file. Read-only shared
+    mappings let every process that opens the snapshot share its pages.
+    """
+    with open(os.path.join(path, name), "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap refuses empty files
+            return memoryview(b"").cast(typecode)
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapping).cast(typecode)
@@ -0,0 +1,86 @@
+"""
+Headless self-play arena for Tic Tac Toe engines
+"""
+
+import argparse
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import tictactoe as ttt
+import tictactoe_unpruned as unpruned
+
+
+def random_player(board, rng):
+    return rng.choice(sorted(ttt.actions(board)))
+
+
+PLAYERS = {
+    "minimax": lambda board, rng: ttt.minimax(board),
+    "unpruned": lambda board, rng: unpruned.minimax(board),
+    "random": random_player,
+}
+
+
+def play_game(task):
+    """
+    Plays one game between two named players and returns
+    (x_name, o_name, winner, {name: [moves, seconds]}).
+    """
+    x_name, o_name, seed = task
+    rng = random.Random(seed)
+    board = ttt.initial_state()
+    timing = {x_name: [0, 0.0], o_name: [0, 0.0]}
+    while not ttt.terminal(board):
+        name = x_name if ttt.player(board) == ttt.X else o_name
+        start = time.perf_counter()
+        move = PLAYERS[name](board, rng)
+        timing[name][1] += time.perf_counter() - start
+        timing[name][0] += 1
+        board = ttt.result(board, move)
+    return x_name, o_name, ttt.winner(board), timing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Tic Tac Toe engines against each other.")
+    parser.add_argument("--games", type=int, default=1000, help="games per pairing and side (default: 1000)")
+    parser.add_argument("--players", nargs="+", choices=sorted(PLAYERS), default=["minimax", "random"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="games played at once (default: one per core); moves are timed "
+                             "by wall clock, so more workers than cores inflate the time per move")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pairings = list(itertools.product(args.players, repeat=2))
+    tasks = [(x_name, o_name, args.seed * 1_000_003 + game)
+             for x_name, o_name in pairings
+             for game in range(args.games)]
+
+    outcomes = {pairing: {ttt.X: 0, ttt.O: 0, None: 0} for pairing in pairings}
+    timing = {name: [0, 0.0] for name in args.players}
+    with ProcessPoolExecutor(args.workers) as executor:
+        for x_name, o_name, winner, game_timing in executor.map(
+                play_game, tasks, chunksize=max(1, len(tasks) // (args.workers * 8))):
+            outcomes[(x_name, o_name)][winner] += 1
+            for name, (moves, seconds) in game_timing.items():
+                timing[name][0] += moves
+                timing[name][1] += seconds
+
+    print(f"{'X':<10} {'O':<10} {'X wins':>8} {'draws':>8} {'O wins':>8}")
+    for (x_name, o_name), counts in outcomes.items():
+        total = sum(counts.values())
+        print(f"{x_name:<10} {o_name:<10} "
+              f"{counts[ttt.X] / total:>8.1%} {counts[None] / total:>8.1%} {counts[ttt.O] / total:>8.1%}")
+
+    # Seconds per move, to three significant figures, so that both a
+    # random player and an engine taking seconds per move show up
+    print(f"\n{'player':<10} {'moves':>9} {'sec/move':>12}")
+    for name, (moves, seconds) in timing.items():
+        per_move = seconds / moves if moves else 0.0
+        print(f"{name:<10} {moves:>9,} {per_move:>12.3g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark the Tic Tac Toe engines over every reachable position
+"""
+
+import argparse
+import random
+import time
+
+import bitboard
+import tictactoe as ttt
+import tictactoe_unpruned as unpruned
+
+
+def reachable_positions():
+    """
+    Returns every position that can come up in a game and is not over yet.
+    """
+    positions = []
+    seen = set()
+    stack = [ttt.initial_state()]
+    while stack:
+        board = stack.pop()
+        key = bitboard.encode(board)
+        if key in seen:
+            continue
+        seen.add(key)
+        if ttt.terminal(board):
+            continue
+        positions.append(board)
+        for action in ttt.actions(board):
+            stack.append(ttt.result(board, action))
+    return positions
+
+
+def run(name, minimax, stats, positions, before_each=None):
+    """
+    Calls an engine's minimax on every position and returns its totals.
+    """
+    totals = {"engine": name, "nodes": 0, "cutoffs": 0, "transposition_hits": 0, "book_hits": 0, "seconds": 0.0}
+    start = time.perf_counter()
+    for board in positions:
+        if before_each is not None:
+            before_each()
+        minimax(board)
+        counters = stats()
+        totals["nodes"] += counters["nodes"]
+        totals["cutoffs"] += counters["cutoffs"]
+        totals["transposition_hits"] += counters["transposition_hits"]
+        totals["book_hits"] += counters["book_hit"]
+    totals["seconds"] = time.perf_counter() - start
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the pruned and unpruned minimax engines.")
+    parser.add_argument("--sample", type=int, help="only use this many random positions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    positions = reachable_positions()
+    if args.sample is not None:
+        positions = random.Random(args.seed).sample(positions, min(args.sample, len(positions)))
+    print(f"Running every engine on {len(positions)} positions...")
+
+    search = lambda board: ttt.minimax(board, use_book=False)
+    results = [run("unpruned", unpruned.minimax, lambda: unpruned.stats, positions)]
+    # Clearing the table before every position measures pruning alone
+    results.append(run("alpha-beta, cold table", search, lambda: ttt.stats, positions,
+                       before_each=bitboard.transpositions.clear))
+    bitboard.transpositions.clear()
+    results.append(run("alpha-beta, shared table", search, lambda: ttt.stats, positions))
+    results.append(run("opening book", ttt.minimax, lambda: ttt.stats, positions))
+    baseline = results[0]["seconds"]
+
+    print(f"{'engine':<26} {'nodes':>11} {'cutoffs':>9} {'tt hits':>9} {'book':>6} {'seconds':>9} {'speedup':>9}")
+    for totals in results:
+        speedup = baseline / totals["seconds"] if totals["seconds"] else float("inf")
+        print(f"{totals['engine']:<26} {totals['nodes']:>11,} {totals['cutoffs']:>9,} "
+              f"{totals['transposition_hits']:>9,} {totals['book_hits']:>6,} "
+              f"{totals['seconds']:>9.3f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Bitboard Tic Tac Toe solver
+"""
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Cell (i, j) is bit 3 * i + j of a player's 9-bit mask
+FULL = (1 << 9) - 1
+
+LINES = (
+    *([(i, j) for j in range(3)] for i in range(3)),
+    *([(i, j) for i in range(3)] for j in range(3)),
+    [(i, i) for i in range(3)],
+    [(i, 2 - i) for i in range(3)],
+)
+WIN_MASKS = tuple(sum(1 << (3 * i + j) for i, j in line) for line in LINES)
+
+# Center first, then corners, then edges, so good moves are tried early
+MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+# Flags for what a transposition table value means
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Maps (mover, opponent) masks to (value, flag); kept across calls
+transpositions = {}
+
+# Search counters, reset by reset_stats
+stats = {"nodes": 0, "cutoffs": 0, "transposition_hits": 0}
+
+# Nodes searched between calls to a search's should_stop
+STOP_INTERVAL = 128
+
+
+class SearchStopped(Exception):
+    pass
+
+
+def reset_stats():
+    for counter in stats:
+        stats[counter] = 0
+
+
+def encode(board):
+    """
+    Returns the (x, o) masks of a list-of-lists board.
+    """
+    x = o = 0
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell == X:
+                x |= 1 << (3 * i + j)
+            elif cell == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def decode(x, o):
+    """
+    Returns the list-of-lists board of a pair of (x, o) masks.
+    """
+    return [[X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY
+             for j in range(3)]
+            for i in range(3)]
+
+
+def has_won(mask):
+    for win in WIN_MASKS:
+        if mask & win == win:
+            return True
+    return False
+
+
+def movers(x, o):
+    """
+    Returns (mover, opponent) masks; X moves whenever the counts are equal.
+    """
+    if bin(x).count("1") <= bin(o).count("1"):
+        return x, o
+    return o, x
+
+
+def negamax(mover, opponent, alpha=-1, beta=1, should_stop=None):
+    """
+    Returns the value of a position for the player about to move:
+    1 for a forced win, 0 for a draw, -1 for a forced loss.
+
+    Raises SearchStopped once should_stop() returns True; positions
+    left unfinished are never stored in the transposition table.
+    """
+    stats["nodes"] += 1
+    if should_stop is not None and stats["nodes"] % STOP_INTERVAL == 0 and should_stop():
+        raise SearchStopped()
+    if has_won(opponent):
+        return -1
+    occupied = mover | opponent
+    if occupied == FULL:
+        return 0
+
+    key = (mover, opponent)
+    entry = transpositions.get(key)
+    if entry is not None:
+        stats["transposition_hits"] += 1
+        value, flag = entry
+        if flag == EXACT:
+            return value
+        if flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    original_alpha = alpha
+    best = -1
+    for cell in MOVE_ORDER:
+        bit = 1 << cell
+        if occupied & bit:
+            continue
+        value = -negamax(opponent, mover | bit, -beta, -alpha, should_stop)
+        if value > best:
+            best = value
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            stats["cutoffs"] += 1
+            break
+
+    if best <= original_alpha:
+        flag = UPPER
+    elif best >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    transpositions[key] = (best, flag)
+    return best
+
+
+def best_move(x, o, should_stop=None):
+    """
+    Returns the optimal action (i, j) for the player to move,
+    or None if the game is already over.
+
+    If should_stop() returns True before the search finishes, returns
+    the best move among those fully searched so far, or the first
+    move in MOVE_ORDER if none were.
+    """
+    mover, opponent = movers(x, o)
+    occupied = mover | opponent
+    if has_won(mover) or has_won(opponent) or occupied == FULL:
+        return None
+
+    best_value, best_cell = -2, None
+    for cell in MOVE_ORDER:
+        bit = 1 << cell
+        if occupied & bit:
+            continue
+        if best_cell is None:
+            best_cell = cell
+        try:
+            value = -negamax(opponent, mover | bit, -1, -best_value, should_stop)
+        except SearchStopped:
+            break
+        if value > best_value:
+            best_value, best_cell = value, cell
+            if best_value == 1:
+                break
+    return divmod(best_cell, 3)
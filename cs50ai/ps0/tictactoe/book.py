@@ -0,0 +1,121 @@
+"""
+Perfect-play opening book for Tic Tac Toe
+"""
+
+import os
+import sys
+
+import bitboard
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+
+# A board's code reads its cells as base-3 digits: 0 empty, 1 X, 2 O
+POSITIONS = 3 ** 9
+
+# Marks codes with no book move: unreachable, terminal or not canonical
+NO_MOVE = 255
+
+# The 8 symmetries of the board, each as the cell every cell moves to
+SYMMETRIES = []
+for turns in range(4):
+    for mirrored in (False, True):
+        permutation = []
+        for cell in range(9):
+            i, j = divmod(cell, 3)
+            if mirrored:
+                j = 2 - j
+            for _ in range(turns):
+                i, j = j, 2 - i
+            permutation.append(3 * i + j)
+        SYMMETRIES.append(tuple(permutation))
+
+POWERS = tuple(3 ** cell for cell in range(9))
+
+# Moves by code, loaded from BOOK_FILE on first use
+table = None
+
+
+def code(x, o, permutation=tuple(range(9))):
+    """
+    Returns the code of a pair of (x, o) masks after moving each
+    cell to where a symmetry's permutation sends it.
+    """
+    total = 0
+    for cell in range(9):
+        if x >> cell & 1:
+            total += POWERS[permutation[cell]]
+        elif o >> cell & 1:
+            total += 2 * POWERS[permutation[cell]]
+    return total
+
+
+def canonical(x, o):
+    """
+    Returns (code, permutation) for the symmetry of a position with the
+    smallest code, which all 8 symmetric positions share.
+    """
+    return min((code(x, o, permutation), permutation) for permutation in SYMMETRIES)
+
+
+def build():
+    """
+    Solves every reachable position once, up to symmetry, and returns
+    a bytearray holding the best cell of each canonical position.
+    """
+    book = bytearray([NO_MOVE]) * POSITIONS
+    seen = set()
+    frontier = [(0, 0)]
+    while frontier:
+        x, o = frontier.pop()
+        key, permutation = canonical(x, o)
+        if key in seen:
+            continue
+        seen.add(key)
+        move = bitboard.best_move(x, o)
+        if move is None:
+            continue
+
+        # Store the move as seen from the canonical orientation
+        book[key] = permutation[3 * move[0] + move[1]]
+        mover, _ = bitboard.movers(x, o)
+        for cell in range(9):
+            bit = 1 << cell
+            if (x | o) & bit:
+                continue
+            frontier.append((x | bit, o) if mover == x else (x, o | bit))
+    return book
+
+
+def lookup(board):
+    """
+    Returns the book's optimal action (i, j) for a board, or None if
+    the board is not in the book or no book file has been built.
+    """
+    global table
+    if table is None:
+        try:
+            with open(BOOK_FILE, "rb") as f:
+                table = f.read()
+        except OSError:
+            table = b""
+    if len(table) != POSITIONS:
+        return None
+
+    x, o = bitboard.encode(board)
+    key, permutation = canonical(x, o)
+    cell = table[key]
+    if cell == NO_MOVE:
+        return None
+    return divmod(permutation.index(cell), 3)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) == 2 else BOOK_FILE
+    book = build()
+    with open(path, "wb") as f:
+        f.write(book)
+    print(f"Wrote {sum(1 for move in book if move != NO_MOVE)} positions to {path}")
+
+
+if __name__ == "__main__":
+    main()
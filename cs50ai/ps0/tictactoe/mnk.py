@@ -0,0 +1,281 @@
+"""
+m,n,k Game Player
+"""
+
+import sys
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Scores a won position; wins found sooner score higher
+WIN = 1_000_000
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class Game():
+    """
+    Tic Tac Toe generalised to an m x n board where k in a row wins.
+
+    Boards are lists of m rows of n cells, like in tictactoe.py, and the
+    methods mirror its functions. minimax searches with alpha-beta and
+    iterative deepening, so on boards too large to solve it still
+    answers within its time budget using a heuristic evaluation.
+    """
+
+    def __init__(self, m=3, n=3, k=3):
+        if not 0 < k <= max(m, n):
+            raise ValueError(f"cannot get {k} in a row on a {m}x{n} board")
+        self.m = m
+        self.n = n
+        self.k = k
+
+        # Every line of k cells, as indices into the flattened board
+        self.windows = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.windows.append(tuple((i + di * s) * n + j + dj * s for s in range(k)))
+        self.windows_by_cell = [[] for _ in range(m * n)]
+        for window in self.windows:
+            for cell in window:
+                self.windows_by_cell[cell].append(window)
+
+        # Cells next to each cell, for trying moves near the action first
+        self.neighbors = []
+        for i in range(m):
+            for j in range(n):
+                self.neighbors.append([
+                    a * n + b
+                    for a in range(max(0, i - 1), min(m, i + 2))
+                    for b in range(max(0, j - 1), min(n, j + 2))
+                    if (a, b) != (i, j)
+                ])
+
+        # Try central cells first when nothing else tells them apart
+        center_i, center_j = (m - 1) / 2, (n - 1) / 2
+        self.centrality = [-(abs(cell // n - center_i) + abs(cell % n - center_j))
+                           for cell in range(m * n)]
+        self.nodes = 0
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        x_count = sum(row.count(X) for row in board)
+        o_count = sum(row.count(O) for row in board)
+        return X if x_count <= o_count else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i, row in enumerate(board) for j, cell in enumerate(row) if cell is EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if board[i][j] is not EMPTY:
+            raise Exception('Invalid move')
+        result_board = [list(row) for row in board]
+        result_board[i][j] = self.player(board)
+        return result_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cells = flatten(board)
+        for window in self.windows:
+            first = cells[window[0]]
+            if first is not EMPTY and all(cells[cell] == first for cell in window):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner(board) is not None or all(cell is not EMPTY for row in board for cell in row)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        won = self.winner(board)
+        return 1 if won == X else -1 if won == O else 0
+
+    def minimax(self, board, time_budget=1.0, max_depth=None):
+        """
+        Returns the best action found for the current player on the
+        board within `time_budget` seconds, or None if the game is over.
+
+        Searches one ply deeper at a time and keeps the move from the
+        deepest search that finished, so a move is always ready when
+        time runs out; searching stops early once the game is solved.
+        """
+        deadline = time.perf_counter() + time_budget
+        if self.terminal(board):
+            return None
+        cells = flatten(board)
+        mover = self.player(board)
+        empty = cells.count(EMPTY)
+        max_depth = empty if max_depth is None else min(max_depth, empty)
+
+        moves = self.ordered_moves(cells, None)
+        best_move = moves[0]
+        self.nodes = 0
+        for depth in range(1, max_depth + 1):
+            try:
+                value, move = self.search_root(cells, mover, depth, moves, deadline)
+            except SearchTimeout:
+                break
+            best_move = move
+            # Search the best move first next time, for earlier cutoffs
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(value) >= WIN - self.m * self.n:
+                break
+        return divmod(best_move, self.n)
+
+    def search_root(self, cells, mover, depth, moves, deadline):
+        alpha, beta = -WIN - 1, WIN + 1
+        best_value, best_move = -WIN - 1, moves[0]
+        for move in moves:
+            cells[move] = mover
+            try:
+                value = -self.negamax(cells, other(mover), move, depth - 1, 1, -beta, -alpha, deadline)
+            finally:
+                cells[move] = EMPTY
+            if value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+        return best_value, best_move
+
+    def negamax(self, cells, mover, last_move, depth, ply, alpha, beta, deadline):
+        """
+        Returns the value of a position for the player about to move,
+        given that `last_move` was just played by their opponent.
+        """
+        # On large boards a single node scans every window, so the clock
+        # is read at every node rather than every so many of them
+        self.nodes += 1
+        if time.perf_counter() > deadline:
+            raise SearchTimeout()
+        if self.completes_window(cells, last_move):
+            return -(WIN - ply)
+        if EMPTY not in cells:
+            return 0
+        if depth == 0:
+            return self.evaluate(cells, mover)
+
+        best = -WIN - 1
+        for move in self.ordered_moves(cells, last_move):
+            cells[move] = mover
+            try:
+                value = -self.negamax(cells, other(mover), move, depth - 1, ply + 1, -beta, -alpha, deadline)
+            finally:
+                cells[move] = EMPTY
+            if value > best:
+                best = value
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+        return best
+
+    def completes_window(self, cells, move):
+        player = cells[move]
+        for window in self.windows_by_cell[move]:
+            if all(cells[cell] == player for cell in window):
+                return True
+        return False
+
+    def ordered_moves(self, cells, last_move):
+        """
+        Returns every empty cell, most promising first: cells next to
+        a stone, ranked by how many open lines they extend, then the
+        rest. Skipping far cells would make found wins and losses
+        unsound, since a far move can be the only one that wins.
+        """
+        near = {neighbor
+                for cell, value in enumerate(cells) if value is not EMPTY
+                for neighbor in self.neighbors[cell] if cells[neighbor] is EMPTY}
+
+        def promise(cell):
+            score = 0
+            for window in self.windows_by_cell[cell]:
+                stones = [cells[c] for c in window if cells[c] is not EMPTY]
+                if stones and all(stone == stones[0] for stone in stones):
+                    score += 4 ** len(stones)
+            return (cell in near, score, self.centrality[cell])
+
+        return sorted((cell for cell, value in enumerate(cells) if value is EMPTY),
+                      key=promise, reverse=True)
+
+    def evaluate(self, cells, mover):
+        """
+        Scores a position for the player about to move by the lines
+        each player could still complete, weighting each open line
+        by how many of its cells are already taken.
+        """
+        score = 0
+        for window in self.windows:
+            mine = theirs = 0
+            for cell in window:
+                value = cells[cell]
+                if value == mover:
+                    mine += 1
+                elif value is not EMPTY:
+                    theirs += 1
+            if mine and not theirs:
+                score += 10 ** mine
+            elif theirs and not mine:
+                score -= 10 ** theirs
+        return max(-WIN // 2, min(WIN // 2, score))
+
+
+def flatten(board):
+    return [cell for row in board for cell in row]
+
+
+def other(player):
+    return O if player == X else X
+
+
+def main():
+    if len(sys.argv) not in (4, 5):
+        sys.exit("Usage: python mnk.py m n k [seconds per move]")
+    m, n, k = (int(arg) for arg in sys.argv[1:4])
+    budget = float(sys.argv[4]) if len(sys.argv) == 5 else 1.0
+
+    game = Game(m, n, k)
+    board = game.initial_state()
+    while not game.terminal(board):
+        start = time.perf_counter()
+        move = game.minimax(board, budget)
+        elapsed = time.perf_counter() - start
+        print(f"{game.player(board)} plays {move} ({game.nodes:,} nodes, {elapsed:.2f} s)")
+        board = game.result(board, move)
+        for row in board:
+            print(" ".join(cell or "." for cell in row))
+    won = game.winner(board)
+    print("Game Over: Tie." if won is None else f"Game Over: {won} wins.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
 import pygame
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import tictactoe as ttt
 
+# Longest the computer may think about a move, in seconds; python runner.py [seconds]
+think_time = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+# Shortest time "Computer thinking..." stays up, so instant moves are still visible
+ai_delay = min(0.5, think_time)
+fps = 30
+
 pygame.init()
 size = width, height = 600, 400
+clock = pygame.time.Clock()
+
+# The AI searches on a worker thread while the window keeps drawing
+executor = ThreadPoolExecutor(max_workers=1)
 
 # Colors
 black = (0, 0, 0)
@@ -19,12 +31,17 @@ moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
 user = None
 board = ttt.initial_state()
-ai_turn = False
+ai_move = None
+ai_started = None
+# Set to make the running search return its best move so far
+ai_stop = threading.Event()
 
 while True:
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
+            ai_stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
             sys.exit()
 
     screen.fill(black)
@@ -110,13 +127,16 @@ while True:
 
         # Check for AI move
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if ai_move is None:
+                # The search stops itself at the deadline and returns its best move so far
+                ai_stop = threading.Event()
+                ai_started = time.monotonic()
+                deadline = ai_started + think_time
+                should_stop = lambda stop=ai_stop, deadline=deadline: stop.is_set() or time.monotonic() >= deadline
+                ai_move = executor.submit(ttt.minimax, board, should_stop=should_stop)
+            elif ai_move.done() and time.monotonic() - ai_started >= ai_delay:
+                board = ttt.result(board, ai_move.result())
+                ai_move = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -141,6 +161,8 @@ while True:
                     time.sleep(0.2)
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
+                    ai_stop.set()
+                    ai_move = None
 
     pygame.display.flip()
+    clock.tick(fps)
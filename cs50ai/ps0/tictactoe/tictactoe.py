@@ -2,13 +2,18 @@
 Tic Tac Toe Player
 """
 
-import math
-import copy
+import time
+
+import bitboard
+import book
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Counters for the most recent minimax call: nodes visited, cutoffs, transposition hits, whether the opening book answered, and wall time
+stats = {}
+
 def initial_state():
     """
     Returns starting state of the board.
@@ -61,7 +66,8 @@ def result(board, action):
     if board[action[0]][action[1]] is not EMPTY:
         raise Exception('Invalid move')
     else: 
-        result_board = copy.deepcopy(board)
+        # rows only hold strings and None, so copying each row is enough
+        result_board = [list(row) for row in board]
         result_board[action[0]][action[1]] = player(board)
     return result_board
 
@@ -70,26 +76,12 @@ def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    # for every cell in the board, check if the next 2 consecutive cells are moves from the same player. We only have to check to the right, down, down-left and down-right directions. 
-    i = 0
-    for row in board:
-        j = 0
-        for cell in row:
-            potential_winner = cell
-            # right direction
-            if j == 0 and board[i][j + 1] == potential_winner and board[i][j + 2] == potential_winner:
-                return potential_winner
-            # down direction
-            if i == 0 and board[i + 1][j] == potential_winner and board[i + 2][j] == potential_winner:
-                return potential_winner                    
-            # down-left
-            if i == 0 and j == 2 and board[i + 1][j - 1] == potential_winner and board[i + 2][j - 2] == potential_winner:
-                return potential_winner                                      
-            # down-right
-            if i == 0 and j == 0 and board[i + 1][j + 1] == potential_winner and board[i + 2][j + 2] == potential_winner:
-                return potential_winner
-            j = j + 1
-        i = i + 1
+    # encode the board as one 9-bit mask per player and compare against every winning line at once
+    x, o = bitboard.encode(board)
+    if bitboard.has_won(x):
+        return X
+    if bitboard.has_won(o):
+        return O
     return None
 
 
@@ -116,57 +108,20 @@ def utility(board):
     else:
         return 0
 
-def max_value(board,current_best_val):
-    #global iteration
-    #iteration = iteration + 1
-    if terminal(board):
-        return utility(board)
-    best_utility_score_now = -999
-    for action in actions(board):
-        best_utility_score_now = max(best_utility_score_now, min_value(result(board,action),current_best_val))
-        # the line below is an "early termination clause". Since the result of this function will always only be used to find a lower "current_best_val", I don't need to keep digging deeper under this action to find out how much higher the output will be
-        if best_utility_score_now > current_best_val:
-            return best_utility_score_now        
-    return best_utility_score_now
-
-def min_value(board,current_best_val):
-    #global iteration
-    #iteration = iteration + 1    
-    if terminal(board):
-        return utility(board)
-    best_utility_score_now = 999
-    for action in actions(board):
-        best_utility_score_now = min(best_utility_score_now, max_value(result(board,action),current_best_val))
-        # the line below is an "early termination clause". Since the result of this function will always only be used to find a higher "current_best_val", I don't need to keep digging deeper under this action to find out how much lower the output will be
-        if best_utility_score_now < current_best_val:
-            return best_utility_score_now
-    return best_utility_score_now     
-
-def minimax(board):
+def minimax(board, use_book=True, should_stop=None):
     """
     Returns the optimal action for the current player on the board.
-    """
-    #global iteration
-    #iteration = 0
-    if player(board) == X:
-        best_utility_score = -999
-        best_action = None
-        for action in actions(board):
-            min_v = min_value(result(board,action),best_utility_score)
-            if best_utility_score < min_v:
-                best_utility_score = min_v
-                best_action = action
-
-    if player(board) == O:
-        best_utility_score = 999
-        best_action = None
-        for action in actions(board):
-            max_v = max_value(result(board,action),best_utility_score)
-            if best_utility_score > max_v:
-                best_utility_score = max_v
-                best_action = action 
-    #print(iteration)               
-    #print(best_action)
-    return best_action
-
 
+    A search that should_stop() cuts short returns the best move found so far.
+    """
+    global stats
+    start = time.perf_counter()
+    bitboard.reset_stats()
+    # every reachable position is in the opening book (see book.py), so this is normally a single table lookup
+    move = book.lookup(board) if use_book else None
+    book_hit = move is not None
+    if not book_hit:
+        # the search runs on bitboards with a transposition table that is kept between calls, so every position is only solved once
+        move = bitboard.best_move(*bitboard.encode(board), should_stop)
+    stats = dict(bitboard.stats, book_hit=book_hit, seconds=time.perf_counter() - start)
+    return move
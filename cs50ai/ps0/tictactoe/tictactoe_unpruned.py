@@ -4,11 +4,15 @@ Tic Tac Toe Player
 
 import math
 import copy
+import time
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Counters for the most recent minimax call; this engine never prunes or caches, so only nodes and wall time change
+stats = {}
+
 
 def initial_state():
     """
@@ -118,8 +122,7 @@ def utility(board):
         return 0
 
 def max_value(board):
-    global iteration
-    iteration = iteration + 1
+    stats["nodes"] = stats["nodes"] + 1
     if terminal(board):
         return utility(board)
     best_utility_score_now = -999
@@ -128,8 +131,7 @@ def max_value(board):
     return best_utility_score_now
 
 def min_value(board):
-    global iteration
-    iteration = iteration + 1    
+    stats["nodes"] = stats["nodes"] + 1
     if terminal(board):
         return utility(board)
     best_utility_score_now = 999
@@ -141,8 +143,9 @@ def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
-    global iteration
-    iteration = 0
+    global stats
+    stats = {"nodes": 0, "cutoffs": 0, "transposition_hits": 0, "book_hit": False}
+    start = time.perf_counter()
     if player(board) == X:
         best_utility_score = -999
         best_action = None
@@ -160,7 +163,7 @@ def minimax(board):
             if best_utility_score > max_v:
                 best_utility_score = max_v
                 best_action = action                
-    print(iteration)
+    stats["seconds"] = time.perf_counter() - start
     return best_action
 
 
@@ -0,0 +1,87 @@
+"""
+Benchmark the entailment backends on ever larger generated puzzles
+"""
+
+import argparse
+import time
+
+import generator
+from logic import KnowledgeBase, model_check
+from sat import sat_check
+
+
+def knowledge_base_backend(knowledge, queries):
+    knowledge_base = KnowledgeBase(*knowledge.conjuncts)
+    return [knowledge_base.entails(query) for query in queries]
+
+
+def backends(workers):
+    """Returns (name, solve) pairs, where solve answers every query
+    about one knowledge base."""
+    found = [
+        ("model_check", lambda knowledge, queries: [model_check(knowledge, query) for query in queries]),
+    ]
+    if workers > 1:
+        found.append((f"model_check x{workers}",
+                      lambda knowledge, queries: [model_check(knowledge, query, workers) for query in queries]))
+    found.append(("KnowledgeBase", knowledge_base_backend))
+    found.append(("sat_check", lambda knowledge, queries: [sat_check(knowledge, query) for query in queries]))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the entailment backends as puzzles grow.")
+    parser.add_argument("--start", type=int, default=2, help="fewest characters (default: 2)")
+    parser.add_argument("--stop", type=int, default=40, help="most characters (default: 40)")
+    parser.add_argument("--step", type=int, default=1)
+    parser.add_argument("--statements", type=float, default=2.0,
+                        help="statements per character (default: 2)")
+    parser.add_argument("--depth", type=int, default=2, help="nesting of each claim (default: 2)")
+    parser.add_argument("--limit", type=float, default=10.0,
+                        help="drop a backend once one puzzle takes it longer than this many seconds (default: 10)")
+    parser.add_argument("--workers", type=int, default=1, help="also run model_check in this many processes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    running = backends(args.workers)
+    fell_over = {}
+    print(f"{'chars':>5} {'symbols':>7} " + " ".join(f"{name:>18}" for name, _ in running))
+    for characters in range(args.start, args.stop + 1, args.step):
+        if len(fell_over) == len(running):
+            break
+        puzzle = generator.generate(characters, round(characters * args.statements),
+                                    args.depth, seed=args.seed * 1_000_003 + characters)
+        queries = puzzle.symbols()
+
+        cells = []
+        answers = {}
+        for name, solve in running:
+            if name in fell_over:
+                cells.append(f"{'-':>18}")
+                continue
+            start = time.perf_counter()
+            answers[name] = solve(puzzle.knowledge, queries)
+            seconds = time.perf_counter() - start
+            cells.append(f"{seconds:>18.4f}")
+            if seconds > args.limit:
+                fell_over[name] = characters
+        print(f"{characters:>5} {len(queries):>7} " + " ".join(cells), flush=True)
+
+        # Every backend must agree, and only the generated roles can be entailed
+        if len(set(map(tuple, answers.values()))) > 1:
+            raise RuntimeError(f"backends disagree on {characters} characters: {answers}")
+        entailed = next(iter(answers.values()))
+        if any(is_entailed and query not in puzzle.solution
+               for query, is_entailed in zip(queries, entailed)):
+            raise RuntimeError(f"entailed a role the puzzle was not generated with, {characters} characters")
+
+    print()
+    for name, _ in running:
+        if name in fell_over:
+            print(f"{name} went over {args.limit:g} s at {fell_over[name]} characters")
+        else:
+            print(f"{name} stayed under {args.limit:g} s throughout")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Random knights-and-knaves puzzles
+"""
+
+import random
+import sys
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+
+class Puzzle():
+    """
+    A generated puzzle: the knowledge it states, the knight and knave
+    symbol of each character, and the roles it was generated from.
+    """
+
+    def __init__(self, names, knowledge, statements):
+        self.names = names
+        self.knights = [Symbol(f"{name} is a Knight") for name in names]
+        self.knaves = [Symbol(f"{name} is a Knave") for name in names]
+        self.knowledge = knowledge
+        # (speaker, claim) pairs, in the order they were said
+        self.statements = statements
+        self.solution = None
+
+    def symbols(self):
+        return self.knights + self.knaves
+
+
+def character_names(n):
+    """Returns n names: A to Z, then A1 to Z1, and so on."""
+    return [chr(ord("A") + i % 26) + (str(i // 26) if i >= 26 else "") for i in range(n)]
+
+
+def generate(characters, statements, depth=2, seed=None):
+    """
+    Returns a Puzzle with `characters` people making `statements`
+    claims in total, each nested up to `depth` connectives deep.
+
+    Every character is given a role first, and each claim is negated
+    if needed so that its speaker tells the truth exactly when they
+    are a knight, so the puzzle always has at least that solution.
+    It may have others; generate more statements to pin it down.
+    """
+    rng = random.Random(seed)
+    puzzle = Puzzle(character_names(characters), None, [])
+    roles = [rng.random() < 0.5 for _ in range(characters)]
+    model = {}
+    for knight, knave, is_knight in zip(puzzle.knights, puzzle.knaves, roles):
+        model[knight.name] = is_knight
+        model[knave.name] = not is_knight
+
+    knowledge = And()
+    for knight, knave in zip(puzzle.knights, puzzle.knaves):
+        # Everyone is a knight or a knave, but not both
+        knowledge.add(Or(knight, knave))
+        knowledge.add(Not(And(knight, knave)))
+
+    for _ in range(statements):
+        speaker = rng.randrange(characters)
+        claim = random_claim(puzzle, rng, depth)
+        if claim.evaluate(model) != roles[speaker]:
+            claim = Not(claim)
+        puzzle.statements.append((speaker, claim))
+        # Either the speaker is a knight and the claim holds, or a knave and it does not
+        knowledge.add(Or(And(puzzle.knights[speaker], claim),
+                         And(puzzle.knaves[speaker], Not(claim))))
+
+    puzzle.knowledge = knowledge
+    puzzle.solution = [puzzle.knights[i] if is_knight else puzzle.knaves[i]
+                       for i, is_knight in enumerate(roles)]
+    return puzzle
+
+
+def random_claim(puzzle, rng, depth):
+    """Returns a random claim about the characters' roles."""
+    if depth == 0 or rng.random() < 0.3:
+        i = rng.randrange(len(puzzle.names))
+        return rng.choice((puzzle.knights, puzzle.knaves))[i]
+    connective = rng.choice((Not, And, Or, Implication, Biconditional))
+    if connective is Not:
+        return Not(random_claim(puzzle, rng, depth - 1))
+    return connective(random_claim(puzzle, rng, depth - 1),
+                      random_claim(puzzle, rng, depth - 1))
+
+
+def main():
+    if len(sys.argv) not in (3, 4):
+        sys.exit("Usage: python generator.py characters statements [seed]")
+    characters, statements = int(sys.argv[1]), int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) == 4 else None
+
+    puzzle = generate(characters, statements, seed=seed)
+    for speaker, claim in puzzle.statements:
+        print(f"{puzzle.names[speaker]} says \"{claim.formula()}\"")
+    print("One solution: " + ", ".join(str(symbol) for symbol in puzzle.solution))
+
+
+if __name__ == "__main__":
+    main()
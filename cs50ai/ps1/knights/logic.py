@@ -1,7 +1,13 @@
 import itertools
+import multiprocessing
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
 
 class Sentence():
+    # _hash is only set by intern(): shared nodes never change, so
+    # their hash can be cached, while other nodes may still be mutated
+    __slots__ = ("_hash", "__weakref__")
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -15,6 +21,11 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def code(self, index):
+        """Returns a Python expression evaluating the sentence on an
+        integer `m` whose bit index[name] holds each symbol's value."""
+        raise Exception("nothing to compile")
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -43,14 +54,18 @@ class Sentence():
 
 
 class Symbol(Sentence):
+    __slots__ = ("name",)
 
     def __init__(self, name):
         self.name = name
+        self._hash = None
 
     def __eq__(self, other):
         return isinstance(other, Symbol) and self.name == other.name
 
     def __hash__(self):
+        if self._hash is not None:
+            return self._hash
         return hash(("symbol", self.name))
 
     def __repr__(self):
@@ -68,16 +83,24 @@ class Symbol(Sentence):
     def symbols(self):
         return {self.name}
 
+    def code(self, index):
+        return f"(m >> {index[self.name]} & 1)"
+
 
 class Not(Sentence):
+    __slots__ = ("operand",)
+
     def __init__(self, operand):
         Sentence.validate(operand)
         self.operand = operand
+        self._hash = None
 
     def __eq__(self, other):
         return isinstance(other, Not) and self.operand == other.operand
 
     def __hash__(self):
+        if self._hash is not None:
+            return self._hash
         return hash(("not", hash(self.operand)))
 
     def __repr__(self):
@@ -92,17 +115,25 @@ class Not(Sentence):
     def symbols(self):
         return self.operand.symbols()
 
+    def code(self, index):
+        return f"(not {self.operand.code(index)})"
+
 
 class And(Sentence):
+    __slots__ = ("conjuncts",)
+
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
         self.conjuncts = list(conjuncts)
+        self._hash = None
 
     def __eq__(self, other):
         return isinstance(other, And) and self.conjuncts == other.conjuncts
 
     def __hash__(self):
+        if self._hash is not None:
+            return self._hash
         return hash(
             ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
         )
@@ -115,6 +146,8 @@ class And(Sentence):
 
     def add(self, conjunct):
         Sentence.validate(conjunct)
+        if self._hash is not None:
+            raise TypeError("cannot add to an interned sentence")
         self.conjuncts.append(conjunct)
 
     def evaluate(self, model):
@@ -129,17 +162,27 @@ class And(Sentence):
     def symbols(self):
         return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
 
+    def code(self, index):
+        if not self.conjuncts:
+            return "True"
+        return "(" + " and ".join(conjunct.code(index) for conjunct in self.conjuncts) + ")"
+
 
 class Or(Sentence):
+    __slots__ = ("disjuncts",)
+
     def __init__(self, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
         self.disjuncts = list(disjuncts)
+        self._hash = None
 
     def __eq__(self, other):
         return isinstance(other, Or) and self.disjuncts == other.disjuncts
 
     def __hash__(self):
+        if self._hash is not None:
+            return self._hash
         return hash(
             ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
         )
@@ -160,13 +203,21 @@ class Or(Sentence):
     def symbols(self):
         return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
 
+    def code(self, index):
+        if not self.disjuncts:
+            return "False"
+        return "(" + " or ".join(disjunct.code(index) for disjunct in self.disjuncts) + ")"
+
 
 class Implication(Sentence):
+    __slots__ = ("antecedent", "consequent")
+
     def __init__(self, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
         self.antecedent = antecedent
         self.consequent = consequent
+        self._hash = None
 
     def __eq__(self, other):
         return (isinstance(other, Implication)
@@ -174,6 +225,8 @@ class Implication(Sentence):
                 and self.consequent == other.consequent)
 
     def __hash__(self):
+        if self._hash is not None:
+            return self._hash
         return hash(("implies", hash(self.antecedent), hash(self.consequent)))
 
     def __repr__(self):
@@ -191,13 +244,19 @@ class Implication(Sentence):
     def symbols(self):
         return set.union(self.antecedent.symbols(), self.consequent.symbols())
 
+    def code(self, index):
+        return f"(not {self.antecedent.code(index)} or {self.consequent.code(index)})"
+
 
 class Biconditional(Sentence):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
         self.left = left
         self.right = right
+        self._hash = None
 
     def __eq__(self, other):
         return (isinstance(other, Biconditional)
@@ -205,6 +264,8 @@ class Biconditional(Sentence):
                 and self.right == other.right)
 
     def __hash__(self):
+        if self._hash is not None:
+            return self._hash
         return hash(("biconditional", hash(self.left), hash(self.right)))
 
     def __repr__(self):
@@ -224,40 +285,190 @@ class Biconditional(Sentence):
     def symbols(self):
         return set.union(self.left.symbols(), self.right.symbols())
 
+    def code(self, index):
+        return f"((not {self.left.code(index)}) == (not {self.right.code(index)}))"
+
+
+# Shared node for each structure, keyed by class and the ids of the
+# already-shared children; entries go away with their last user
+interned = weakref.WeakValueDictionary()
+
+
+def intern(sentence):
+    """Returns the shared node structurally equal to sentence.
+
+    Equal subformulas become one object, so work memoized per node,
+    such as CNF encoding, is done once however often they occur.
+    Shared nodes cache their hash and must not be changed, since
+    that would change every sentence containing them; And.add
+    refuses to."""
+    Sentence.validate(sentence)
+    if isinstance(sentence, Symbol):
+        key = (Symbol, sentence.name)
+        make = lambda: Symbol(sentence.name)
+    elif isinstance(sentence, Not):
+        operand = intern(sentence.operand)
+        key = (Not, id(operand))
+        make = lambda: Not(operand)
+    elif isinstance(sentence, And):
+        conjuncts = [intern(conjunct) for conjunct in sentence.conjuncts]
+        key = (And, *map(id, conjuncts))
+        make = lambda: And(*conjuncts)
+    elif isinstance(sentence, Or):
+        disjuncts = [intern(disjunct) for disjunct in sentence.disjuncts]
+        key = (Or, *map(id, disjuncts))
+        make = lambda: Or(*disjuncts)
+    elif isinstance(sentence, Implication):
+        antecedent, consequent = intern(sentence.antecedent), intern(sentence.consequent)
+        key = (Implication, id(antecedent), id(consequent))
+        make = lambda: Implication(antecedent, consequent)
+    elif isinstance(sentence, Biconditional):
+        left, right = intern(sentence.left), intern(sentence.right)
+        key = (Biconditional, id(left), id(right))
+        make = lambda: Biconditional(left, right)
+    else:
+        raise TypeError(f"cannot intern {sentence!r}")
+
+    node = interned.get(key)
+    if node is None:
+        node = make()
+        # Its children are interned too, so the hash can never go stale
+        node._hash = hash(node)
+        interned[key] = node
+    return node
+
+
+class KnowledgeBase():
+    """A conjunction of sentences, kept together with every model
+    that satisfies it so that many queries share one enumeration."""
+
+    def __init__(self, *sentences):
+        self.sentences = []
+        # Symbol names in the order of their bits in a model
+        self.symbols = []
+        # Each satisfying model as an integer; with no symbols yet,
+        # the single empty model satisfies the empty conjunction
+        self.models = [0]
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add(self, sentence):
+        """Adds a sentence, keeping only the models it holds in."""
+        Sentence.validate(sentence)
+        known = set(self.symbols)
+        new = sorted(symbol for symbol in sentence.symbols() if symbol not in known)
+        offset = len(self.symbols)
+        self.symbols.extend(new)
+        self.sentences.append(sentence)
+
+        # Only the new symbols need enumerating, once per surviving model
+        holds = compile_sentence(sentence, self.symbols)
+        self.models = [
+            model | extension << offset
+            for model in self.models
+            for extension in range(2 ** len(new))
+            if holds(model | extension << offset)
+        ]
+
+    def entails(self, query):
+        """Checks if the knowledge base entails query."""
+        known = set(self.symbols)
+        extra = sorted(symbol for symbol in query.symbols() if symbol not in known)
+        offset = len(self.symbols)
+        holds = compile_sentence(query, self.symbols + extra)
+        return all(
+            holds(model | extension << offset)
+            for model in self.models
+            for extension in range(2 ** len(extra))
+        )
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
-
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
-
-        # If model has an assignment for each symbol
-        if not symbols:
-
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
-        else:
 
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
+def compile_sentence(sentence, symbols):
+    """Compiles a sentence into a function of an integer whose bit i
+    holds the value of symbols[i], returning the sentence's value."""
+    index = {symbol: i for i, symbol in enumerate(symbols)}
+    try:
+        return eval(f"lambda m: bool({sentence.code(index)})")
+    except (SyntaxError, RecursionError, MemoryError):
+        # Too deeply nested for the Python parser; walk the tree instead
+        return lambda m: sentence.evaluate(
+            {symbol: bool(m >> i & 1) for i, symbol in enumerate(symbols)})
 
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
 
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
+def model_check(knowledge, query, workers=None):
+    """Checks if knowledge base entails query.
 
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
+    With `workers` above 1, the models are split among that many
+    processes, which suits sentences with too many symbols to enumerate
+    quickly in one; use os.cpu_count() to take every core."""
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
-
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    if workers is not None and workers > 1 and len(symbols) >= PARALLEL_SYMBOLS:
+        return parallel_model_check(knowledge, query, symbols, workers)
+
+    # Compile both sentences so each model is a single integer
+    knowledge_holds = compile_sentence(knowledge, symbols)
+    query_holds = compile_sentence(query, symbols)
+
+    # Check that the query is true in every model where the knowledge base is
+    for model in range(2 ** len(symbols)):
+        if knowledge_holds(model) and not query_holds(model):
+            return False
+    return True
+
+
+# Below this many symbols, starting processes costs more than it saves
+PARALLEL_SYMBOLS = 16
+
+# Models a worker checks between looks at whether to stop
+CANCEL_INTERVAL = 4096
+
+# Set in each worker process by start_worker
+worker = {}
+
+
+def parallel_model_check(knowledge, query, symbols, workers):
+    """Checks entailment by fixing the first k symbols to each of their
+    2^k values and checking those partitions of the models in a process
+    pool, stopping every worker once one finds a counterexample."""
+
+    # Several partitions per worker, so one slow partition cannot hold up the rest
+    k = min(len(symbols), max(workers * 8, 1).bit_length())
+    cancelled = multiprocessing.Event()
+    executor = ProcessPoolExecutor(
+        workers, initializer=start_worker,
+        initargs=(knowledge, query, symbols, cancelled))
+    try:
+        pending = {executor.submit(check_partition, partition, k)
+                   for partition in range(2 ** k)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if any(future.result() is False for future in done):
+                cancelled.set()
+                return False
+        return True
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def start_worker(knowledge, query, symbols, cancelled):
+    # Compiled functions cannot be pickled, so each worker compiles its own
+    worker["knowledge"] = compile_sentence(knowledge, symbols)
+    worker["query"] = compile_sentence(query, symbols)
+    worker["count"] = len(symbols)
+    worker["cancelled"] = cancelled
+
+
+def check_partition(partition, k):
+    """Checks the models whose first k symbols are the bits of
+    `partition`; returns None if cancelled before finishing."""
+    knowledge_holds, query_holds = worker["knowledge"], worker["query"]
+    models = range(partition, 2 ** worker["count"], 2 ** k)
+    for start in range(0, len(models), CANCEL_INTERVAL):
+        if worker["cancelled"].is_set():
+            return None
+        for model in models[start:start + CANCEL_INTERVAL]:
+            if knowledge_holds(model) and not query_holds(model):
+                return False
+    return True
@@ -0,0 +1,239 @@
+from logic import And, Biconditional, Implication, Not, Or, Symbol, intern
+
+
+class CNF():
+    """Clauses in conjunctive normal form, built by Tseitin encoding.
+
+    Variables are positive integers and a literal is a variable or its
+    negation. Every compound subformula gets a fresh variable that is
+    constrained to equal it, so the clauses grow linearly with the
+    formula instead of exponentially as with distributing Or over And.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.variables = {}
+        self.count = 0
+        # Literal already encoding each subformula, so shared ones are reused
+        self.encoded = {}
+        self.true = None
+
+    def new_variable(self):
+        self.count += 1
+        return self.count
+
+    def variable(self, name):
+        """Returns the variable of a symbol name."""
+        if name not in self.variables:
+            self.variables[name] = self.new_variable()
+        return self.variables[name]
+
+    def constant_true(self):
+        if self.true is None:
+            self.true = self.new_variable()
+            self.clauses.append([self.true])
+        return self.true
+
+    def add(self, sentence):
+        """Adds the clauses asserting that a sentence is true."""
+        # Interning first makes equal subformulas one node, so each is encoded once
+        self.clauses.append([self.encode(intern(sentence))])
+
+    def encode(self, sentence):
+        """Returns a literal that is true exactly when the sentence is."""
+        literal = self.encoded.get(sentence)
+        if literal is None:
+            literal = self._encode(sentence)
+            self.encoded[sentence] = literal
+        return literal
+
+    def _encode(self, sentence):
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.encode(sentence.operand)
+        if isinstance(sentence, Implication):
+            return self.encode_or([-self.encode(sentence.antecedent),
+                                   self.encode(sentence.consequent)])
+        if isinstance(sentence, And):
+            return -self.encode_or([-self.encode(conjunct) for conjunct in sentence.conjuncts])
+        if isinstance(sentence, Or):
+            return self.encode_or([self.encode(disjunct) for disjunct in sentence.disjuncts])
+        if isinstance(sentence, Biconditional):
+            left, right = self.encode(sentence.left), self.encode(sentence.right)
+            v = self.new_variable()
+            self.clauses.extend([[-v, -left, right], [-v, left, -right],
+                                 [v, left, right], [v, -left, -right]])
+            return v
+        raise TypeError(f"cannot encode {sentence!r}")
+
+    def encode_or(self, literals):
+        if not literals:
+            return -self.constant_true()
+        if len(literals) == 1:
+            return literals[0]
+        v = self.new_variable()
+        self.clauses.extend([v, -literal] for literal in literals)
+        self.clauses.append([-v] + literals)
+        return v
+
+
+class Solver():
+    """DPLL satisfiability solver over a CNF.
+
+    Unit propagation uses two watched literals per clause, so assigning
+    a literal only visits the clauses watching its negation, and pure
+    literals are assigned before the search starts.
+    """
+
+    def __init__(self, cnf):
+        self.cnf = cnf
+        self.values = [0] * (cnf.count + 1)
+        self.trail = []
+        # Each decision level is (trail length before it, decision literal, flipped)
+        self.levels = []
+        self.watches = {}
+        self.clauses = []
+        self.conflict = False
+
+        for clause in cnf.clauses:
+            clause = list(dict.fromkeys(clause))
+            if any(-literal in clause for literal in clause):
+                continue
+            if not clause:
+                self.conflict = True
+            elif len(clause) == 1:
+                if not self.assign(clause[0]):
+                    self.conflict = True
+            else:
+                self.clauses.append(clause)
+                index = len(self.clauses) - 1
+                self.watches.setdefault(clause[0], []).append(index)
+                self.watches.setdefault(clause[1], []).append(index)
+
+        # Branch on the variables that occur most often first
+        occurrences = [0] * (cnf.count + 1)
+        for clause in self.clauses:
+            for literal in clause:
+                occurrences[abs(literal)] += 1
+        self.order = sorted(range(1, cnf.count + 1), key=lambda v: -occurrences[v])
+
+    def value(self, literal):
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def assign(self, literal):
+        """Makes a literal true; returns False if it is already false."""
+        value = self.value(literal)
+        if value:
+            return value > 0
+        self.values[abs(literal)] = 1 if literal > 0 else -1
+        self.trail.append(literal)
+        return True
+
+    def propagate(self, start):
+        """Assigns every literal forced by the trail from `start` on.
+
+        Returns False on a conflict.
+        """
+        i = start
+        while i < len(self.trail):
+            false = -self.trail[i]
+            i += 1
+            watching = self.watches.get(false, [])
+            kept = []
+            for n, index in enumerate(watching):
+                clause = self.clauses[index]
+                # Keep the false literal in position 1
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) > 0:
+                    kept.append(index)
+                    continue
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) >= 0:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if not self.assign(clause[0]):
+                        kept.extend(watching[n + 1:])
+                        self.watches[false] = kept
+                        return False
+            self.watches[false] = kept
+        return True
+
+    def eliminate_pure_literals(self):
+        """Assigns literals whose negation occurs in no open clause."""
+        while True:
+            seen = set()
+            for clause in self.clauses:
+                if any(self.value(literal) > 0 for literal in clause):
+                    continue
+                seen.update(literal for literal in clause if not self.value(literal))
+            pure = [literal for literal in seen if -literal not in seen]
+            if not pure:
+                return
+            for literal in pure:
+                self.assign(literal)
+
+    def backtrack(self):
+        """Undoes decisions up to the latest one with an untried value
+        and tries that value. Returns False if none is left."""
+        while self.levels:
+            start, decision, flipped = self.levels.pop()
+            for literal in self.trail[start:]:
+                self.values[abs(literal)] = 0
+            del self.trail[start:]
+            if not flipped:
+                self.levels.append((start, -decision, True))
+                self.assign(-decision)
+                return True
+        return False
+
+    def solve(self):
+        """Returns True if the clauses can all be satisfied."""
+        if self.conflict or not self.propagate(0):
+            return False
+        self.eliminate_pure_literals()
+        if not self.propagate(0):
+            return False
+
+        next_variable = 0
+        while True:
+            while next_variable < len(self.order) and self.values[self.order[next_variable]]:
+                next_variable += 1
+            if next_variable == len(self.order):
+                return True
+            start = len(self.trail)
+            decision = self.order[next_variable]
+            self.levels.append((start, decision, False))
+            self.assign(decision)
+            while not self.propagate(self.levels[-1][0]):
+                if not self.backtrack():
+                    return False
+            # Backtracking may have unassigned earlier variables
+            next_variable = 0
+
+    def model(self):
+        """Returns the truth value of every symbol after a successful solve."""
+        return {name: self.values[v] > 0 for name, v in self.cnf.variables.items()}
+
+
+def satisfiable(sentence):
+    """Returns a model of the sentence's symbols that makes it true,
+    or None if there is none."""
+    cnf = CNF()
+    cnf.add(sentence)
+    solver = Solver(cnf)
+    return solver.model() if solver.solve() else None
+
+
+def sat_check(knowledge, query):
+    """Checks if knowledge base entails query, by showing that the
+    knowledge base and the negated query cannot both be true."""
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(Not(query))
+    return not Solver(cnf).solve()
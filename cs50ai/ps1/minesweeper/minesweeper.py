@@ -1,5 +1,6 @@
 import itertools
 import random
+from collections import deque
 #import pickle
 
 class Minesweeper():
@@ -160,23 +161,78 @@ class MinesweeperAI():
         # List of sentences about the game known to be true
         self.knowledge = []
 
+        # Index in knowledge of each sentence, keyed by its
+        # (frozenset of cells, count) so duplicates are found by hashing
+        self.positions = {}
+
+        # Keys of the sentences each cell appears in
+        self.sentences_with = {}
+
+        # Keys of sentences added or changed but not yet inferred from
+        self.pending = deque()
+
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
+        if cell in self.mines:
+            return
         self.mines.add(cell)
-        for sentence in self.knowledge:
+        for key in self.sentences_with.pop(cell, ()):
+            sentence = self.remove_sentence(key)
             sentence.mark_mine(cell)
+            self.add_sentence(sentence)
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
+        if cell in self.safes:
+            return
         self.safes.add(cell)
-        for sentence in self.knowledge:
+        for key in self.sentences_with.pop(cell, ()):
+            sentence = self.remove_sentence(key)
             sentence.mark_safe(cell)
+            self.add_sentence(sentence)
+
+    def add_sentence(self, sentence):
+        """
+        Adds a sentence to the knowledge, without the cells already
+        known to be safe or mines, unless it says nothing new.
+        """
+        for cell in sentence.cells & self.safes:
+            sentence.mark_safe(cell)
+        for cell in sentence.cells & self.mines:
+            sentence.mark_mine(cell)
+        if not sentence.cells:
+            return
+        key = (frozenset(sentence.cells), sentence.count)
+        if key in self.positions:
+            return
+        self.positions[key] = len(self.knowledge)
+        self.knowledge.append(sentence)
+        for cell in key[0]:
+            self.sentences_with.setdefault(cell, set()).add(key)
+        self.pending.append(key)
+
+    def remove_sentence(self, key):
+        """
+        Removes a sentence from the knowledge and returns it.
+        """
+        # Move the last sentence into its place, so removal takes constant time
+        position = self.positions.pop(key)
+        sentence = self.knowledge[position]
+        last = self.knowledge.pop()
+        if last is not sentence:
+            self.knowledge[position] = last
+            self.positions[(frozenset(last.cells), last.count)] = position
+        for cell in key[0]:
+            keys = self.sentences_with.get(cell)
+            if keys is not None:
+                keys.discard(key)
+        return sentence
 
     def adjacent_cells(self, cell):
         neighbors = set()
@@ -213,80 +269,39 @@ class MinesweeperAI():
         """
         # 1) mark cell as moved
         self.moves_made.add(cell)
-        # 2) mark cell as safe:
-        self.safes.add(cell)
+        # 2) mark cell as safe, updating any sentence it was in
+        self.mark_safe(cell)
         # 3) add a new sentence to the AI's knowledge base
-        new_sentence = Sentence(self.adjacent_cells(cell),count)
-        print('new_sentence_cells and count:')
-        print(new_sentence.cells)
-        print(new_sentence.count)
-        # for cell in self.safes:
-        #     if cell in new_sentence.cells:
-        #         new_sentence.mark_safe(cell)
-        # for cell in self.mines:
-        #     if cell in new_sentence.cells:
-        #         new_sentence.mark_mine(cell)            
-        self.knowledge.append(new_sentence)
-        
-        # now loop through knowledge base to do #4 and #5
-        nth_sentence = 0
-
-        while nth_sentence < len(self.knowledge):
-            set1 = self.knowledge[nth_sentence]
-            nth_sentence = nth_sentence + 1
-            if len(set1.cells) == 0:
-                continue   
-            # 4) mark any additional cells as safe or as mines
-            if len(set1.known_mines()) > 0:
-                for mine in set1.known_mines():
-                    self.mines.add(mine)
-            if len(set1.known_safes()) > 0:
-                for safe in set1.known_safes():
-                    self.safes.add(safe)                           
-            
-            # first update the existing sentences with new information:
-            safe_in_set1 = set1.cells.intersection(self.safes)
-            for safe in safe_in_set1:
-                set1.mark_safe(safe)
-            mines_in_set1 = set1.cells.intersection(self.mines)
-            for mine in mines_in_set1:
-                set1.mark_mine(mine)  
-
-            if len(set1.cells) == 0:
-                continue                          
-            # 5) add any new sentences to the AI's knowledge base
-            # we compare every sentence against every other sentence, check if any of them are subsets of each other
-            for set2 in self.knowledge:
-                if len(set2.cells) == 0:
-                    continue
-                if set1 == set2:
+        self.add_sentence(Sentence(self.adjacent_cells(cell), count))
+
+        # 4) and 5) infer from each new or changed sentence in turn.
+        # Only sentences sharing a cell with it can be subsets or
+        # supersets of it, so the rest of the knowledge is never visited
+        while self.pending:
+            key = self.pending.popleft()
+            if key not in self.positions:
+                # Changed again since it was queued; its new key is queued too
+                continue
+            cells, count = key
+            if count == 0:
+                for safe in cells:
+                    self.mark_safe(safe)
+                continue
+            if count == len(cells):
+                for mine in cells:
+                    self.mark_mine(mine)
+                continue
+
+            related = set().union(*(self.sentences_with[c] for c in cells))
+            related.discard(key)
+            for other in related:
+                if other not in self.positions:
                     continue
-                if set1.cells.issubset(set2.cells):
-                    s3cells = set2.cells.difference(set1.cells)
-                    set3 = Sentence(s3cells,set2.count - set1.count)
-                    # now check if the sentence already exists in knowledge base to prevent infinite loops
-                    has_sentence = False
-                    for existing_sentence in self.knowledge:
-                        if set3 == existing_sentence:
-                            has_sentence = True
-                    if has_sentence == False:
-                        self.knowledge.append(set3)
-                        # now that sentence has been added, we need to start from the top and check every sentence again
-                        print('new sentence inferred: ')
-                        print('set 1: ' + str(set1.cells))
-                        print('set 2: ' + str(set2.cells))
-                        print('outcome: ' + str(set3.cells))
-                        nth_sentence = 0
-            
-        #with open('knowledge_' + str(len(self.moves_made)), 'wb') as f:
-            # Pickle the 'data' dictionary using the highest protocol available.
-            #pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
-
-        print('add knowledge done, below are the safe cells: ')
-        print(self.safes)
-
-        print('add knowledge done, below are the cells with mines: ')
-        print(self.mines)        
+                other_cells, other_count = other
+                if cells < other_cells:
+                    self.add_sentence(Sentence(other_cells - cells, other_count - count))
+                elif other_cells < cells:
+                    self.add_sentence(Sentence(cells - other_cells, count - other_count))
 
     def make_safe_move(self):
         """